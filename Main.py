@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 import copy
-from math import factorial
-from sympy import isprime
+import struct
+import sys
+
+import limbs
+from context import Context, getcontext
 
 
 def remove_leading_zeros(s: list[int]) -> list[int]:
@@ -33,10 +36,16 @@ def remove_trailing_zeros(s: list[int]) -> list[int]:
 
 class Glide:
     """
-    Arithmetic on arbitrarily accurate denary floats. These are implemented as 
-    lists of ints 0-9, sign stored as a string. Arithmetic is defined as operations over the
-    arrays, but the glides are neatly represented as number strings.
-    
+    Arithmetic on arbitrarily accurate denary floats. These are implemented as
+    packed arrays of base 10^9 limbs (nine digits each) with a decimal exponent, sign stored as a
+    string. Arithmetic is defined as operations over the limbs, but the glides are neatly
+    represented as number strings, and get_units/get_decs still give lists of ints 0-9.
+
+    Glides behave as values: arithmetic, the in-place operators included, always hands back a
+    new Glide and never touches its operands, so limb buffers can be shared between Glides.
+    Only the explicit setters and accumulate change a Glide, and the interned constants ZERO,
+    ONE and TEN refuse even those.
+
     ...
 
     Attributes
@@ -49,19 +58,23 @@ class Glide:
         Gets the representation of the Glide.
     """
 
-    def __init__(self, number: float):
+    __slots__ = ("_limbs", "_exp", "_views", "_precision", "_sign", "_private")
 
-        """
-        Decimal representation attributes
-        """
-        self._units = []
-        self._decs = []
+    def __init__(self, number: float):
 
         """
-        Scientific represenation attributes
+        Packed representation attributes. The magnitude of the Glide is the coefficient held in
+        _limbs (base 10^9, least significant limb first) times 10 ** _exp, the one canonical
+        form. The units/decs and mantissa/pow representations are views derived from it when
+        they're asked for, and cached in _views until the coefficient or exponent changes. _views
+        is None until the first one is asked for, so Glides that are only computed with don't
+        carry an empty dict around. _private says no other Glide holds _limbs, so accumulate
+        can work in it.
         """
-        self._mantissa = []
-        self._pow = 0
+        self._limbs = limbs.new()
+        self._exp = 0
+        self._views = None
+        self._private = False
 
         """
         Attributes for properties of the Glide
@@ -69,101 +82,146 @@ class Glide:
         self._precision = None
         self._sign = "+ve"
 
-        self.from_float(number)
+        if isinstance(number, int):  # no need to go through a float, and big ints stay exact
+            self._limbs = limbs.from_int(abs(number))
+            self._sign = "-ve" if number < 0 else "+ve"
+        else:
+            self.from_float(number)
+
+    @classmethod
+    def _from_packed(cls, buffer, exp: int = 0, negative: bool = False):
+        """
+        The internal constructor: a Glide straight from a limb buffer (which it takes over)
+        and a decimal exponent, with no parsing.
+        """
+        g = cls.__new__(cls)
+        g._limbs = buffer
+        g._exp = exp
+        g._views = None
+        g._private = False
+        g._precision = None
+        g._sign = "-ve" if negative else "+ve"
+
+        return g
 
     def __repr__(self):
         return f"Glide({self})"
 
     def __str__(self):
-        s = ""
+        units, decs = self._digit_strings()
 
         if self._sign == "-ve":
-            s += "-"
+            return f"-{units}.{decs}"
+
+        return f"{units}.{decs}"
 
-        for c in self._units:
-            s += str(c)
+    def _view(self, name: str, compute):
+        """
+        A derived view of the value, computed the first time it's asked for and then cached
+        until the coefficient or exponent changes.
+        """
+        if self._views is None:
+            self._views = {}
 
-        s += "."
+        try:
+            return self._views[name]
+        except KeyError:
+            view = self._views[name] = compute()
+            return view
 
-        for d in self._decs:
-            s += str(d)
+    def _coefficient_text(self) -> str:
+        return self._view("text", lambda: limbs.to_str(self._limbs))
 
-        return s
+    def _digit_strings(self) -> tuple[str, str]:
+        """
+        The units and decs as strings of digits, formatted in one go from the limbs.
+        """
+        return self._view("strings", self._format_digits)
 
-    def get_units(self):
-        return self._units
+    def _format_digits(self) -> tuple[str, str]:
+        digits = self._coefficient_text()
+        if self._exp >= 0:
+            return (digits + "0" * self._exp if self._limbs else digits), "0"
 
-    def set_units(self, new_units):
-        self._units = new_units
+        scale = -self._exp
+        digits = digits.rjust(scale + 1, "0")
+
+        return digits[:-scale], digits[-scale:]
+
+    def _set_packed(self, new_limbs, exp: int):
+        self._limbs = new_limbs
+        self._exp = exp
+        self._views = None
 
         return self
 
+    def _set_digits(self, units: list[int], decs: list[int]):
+        return self._set_packed(limbs.from_digits(units + decs), -len(decs))
+
+    def _aligned_limbs(self, other):
+        """
+        Get the limbs of self and other brought to a common exponent, along with that exponent.
+        """
+        exp = min(self._exp, other._exp)
+        a = self._limbs if self._exp == exp else limbs.shift_up(self._limbs, self._exp - exp)
+        b = other._limbs if other._exp == exp else limbs.shift_up(other._limbs, other._exp - exp)
+
+        return a, b, exp
+
+    def get_units(self):
+        units = self._view("units", lambda: limbs.str_to_digits(self._digit_strings()[0]))
+        return list(units)
+
+    def set_units(self, new_units):
+        return self._set_digits(new_units, self.get_decs() if self._exp < 0 else [])
+
     def get_decs(self):
-        return self._decs
+        decs = self._view("decs", lambda: limbs.str_to_digits(self._digit_strings()[1]))
+        return list(decs)
 
     def set_decs(self, new_decs):
-        self._decs = new_decs
-
-        return self
+        return self._set_digits(self.get_units(), new_decs)
 
     def get_pow(self):
-        return self._pow
+        if not self._limbs:
+            return 0
+
+        return limbs.num_digits(self._limbs) + self._exp - 1
 
     def set_pow(self, new_pow: int):
-        self._pow = new_pow
-        return self
+        """
+        Moving the leading digit is just a change of exponent.
+        """
+        return self._set_packed(self._limbs, self._exp + new_pow - self.get_pow()).trim()
 
     def get_mantissa(self):
-        return self._mantissa
+        if not self._limbs:
+            return [0]
+
+        mantissa = self._view("mantissa", lambda: self._coefficient_text().rstrip("0"))
+        return limbs.str_to_digits(mantissa)
 
     def set_mantissa(self, mant: list[int]):
-        self._mantissa = mant
+        return self._set_scientific(mant, self.get_pow())
 
-        return self
+    def _set_scientific(self, mant: list[int], pow: int):
+        """
+        Set the value from a mantissa (leading digit first) and the power of its leading digit.
+        """
+        return self._set_packed(limbs.from_digits(mant), pow - len(mant) + 1)
 
     def update_scientific(self):
         """
-        Based on the currently stored decimal represenation, update the scientific representation.
+        The scientific representation is derived from the coefficient and exponent when it's
+        asked for, so this just trims the Glide.
         """
-        self.trim()
-
-        if self == Glide(0):
-            self.set_pow(0)
-            self.set_mantissa(0)
-            return self
-
-        if self.get_decs() == [0]:  # case that the number is an integer
-            self.set_pow(len(self.get_units()) - 1)
-
-            self.set_mantissa(remove_trailing_zeros(self.get_units()))
-
-        if self.get_units() == [0]: #  case that the number is between 0 and 1
-            trimmed_mant = remove_leading_zeros(self.get_decs())
-            leading_zeros = len(self.get_decs()) - len(trimmed_mant)
-            self.set_pow(- leading_zeros - 1)
-            self.set_mantissa(trimmed_mant)
-
-        else:
-            self.set_pow(len(self.get_units()) - 1)
-            self.set_mantissa(self.get_units() + self.get_decs())
-
-        return self
+        return self.trim()
 
     def update_decimal(self):
         """
-        Update the decimal representation of the Glide based on the currently stored
-        scientific representation.
+        The decimal representation is derived from the coefficient and exponent when it's
+        asked for, so this just trims the Glide.
         """
-        if self.get_pow() == 0:
-            self.set_units([self.get_mantissa()[0]])
-            self.set_decs(self.get_mantissa()[1:])
-        elif self.get_pow() > 0:
-            self.set_units(self.get_mantissa()[:self.get_pow()+1])
-            self.set_decs(self.get_mantissa()[self.get_pow()+1:])
-        else:
-            self.set_units([0])
-            self.set_decs([0] * (abs(self.get_pow()) - 1) + self.get_mantissa())
-
         return self.trim()
 
     def get_sign(self):
@@ -200,12 +258,13 @@ class Glide:
 
     def from_float(self, number: float):
         try:
-            if number < 0:
+            num_str = str(float(number))
+
+            if num_str.startswith("-"):  # catches -0.0 too
                 self.set_sign("-ve")
 
             skip_on_negative = {"+ve": 0, "-ve": 1}
 
-            num_str = str(float(number))
             dot = num_str.index(".")
 
             units = []
@@ -217,15 +276,16 @@ class Glide:
             for d in num_str[dot + 1:]:
                 decs.append(int(d))
 
-            self.set_units(units)
-            self.set_decs(decs)
+            self._set_digits(units, decs)
 
         except TypeError:
             print("Can't make sense of the input")
             raise
 
     def get_length(self):
-        return len(self.get_units()) + len(self.get_decs())
+        int_digits = limbs.num_digits(self._limbs) + self._exp
+
+        return max(int_digits, 1) + max(-self._exp, 1)
 
     def left_shift(self, shift: int):
         if shift == 0:
@@ -233,18 +293,8 @@ class Glide:
         elif shift < 0:
             return self.right_shift(abs(shift))
 
-        if self.get_decs() == [0]: #  then no need to worry about things right of the decimal point
-            self.set_units(self.get_units() + [0] * shift)
-            return self.trim()
-
-        if shift <= len(self.get_decs()):
-            self.set_units(self.get_units() + self.get_decs()[:shift])
-            self.set_decs(self.get_decs()[shift:])
-            return self.trim()
-
-        self.set_units(self.get_units() + self.get_decs() + [0] * (shift - len(self.get_decs())))
-        self.set_decs([0])
-        return self.trim()
+        # the digits stay put, only the exponent moves
+        return self._set_packed(self._limbs, self._exp + shift).trim()
 
     def right_shift(self, shift: int):
 
@@ -253,422 +303,322 @@ class Glide:
         elif shift < 0:
             return self.left_shift(abs(shift))
 
-        if self.get_units() == [0]:
-            self.set_decs([0] * shift + self.get_decs())
-            return self.trim()
-
-        if shift <= len(self.get_units()):
-            self.set_decs(self.get_units()[-shift:] + self.get_decs())
-            self.set_units(self.get_units()[:-shift])
-            return self.trim()
-
-        self.set_decs([0] * (shift - len(self.get_decs()) - 1) + self.get_units() + self.get_decs())
-        self.set_units([0])
-        return self.trim()
+        return self._set_packed(self._limbs, self._exp - shift).trim()
 
     def trim(self):
         """
-        Get rid of leading/trailing zeros on the decimal represenation of the Glide.
+        Get rid of trailing zeros after the decimal point, working on whole limbs where possible.
+        Leading zeros never get stored in the packed representation.
 
         Returns
         -------
         self: the updated Glide.
         """
-        if not self.get_units():
-            self.set_units([0])
-        else:
-            self.set_units(remove_leading_zeros(self.get_units()))
+        if not self._limbs:
+            return self._set_packed(self._limbs, 0) if self._exp else self
 
-        if not self.get_decs():
-            self.set_decs([0])
-        else:
-            self.set_decs(remove_trailing_zeros(self.get_decs()))
+        if self._exp >= 0:
+            return self
 
-        return self
+        zeros = min(limbs.trailing_zeros(self._limbs), -self._exp)
+        if zeros:
+            self._set_packed(limbs.shift_down(self._limbs, zeros), self._exp + zeros)
 
-    def __abs__(self):
-        a = copy.copy(self)
-        return a.set_sign("+ve")
-
-    def __neg__(self):
-        if self.get_sign() == "+ve":
-            return self.set_sign("-ve")
-        elif self.get_sign() == "-ve":
-            return self.set_sign("+ve")
-        else:
-            raise AttributeError(f"Glide didn't have a valid sign. ({self.get_sign})")
-
-    def __eq__(self, other):
-        if self.get_decs() == other.get_decs() and \
-                self.get_units() == other.get_units() and \
-                self.get_sign() == other.get_sign():
-            return True
-        else:
-            return False
+        return self
 
-    def __gt__(self, other):
-        if self.get_sign() == "+ve" and other.get_sign() == "-ve":
-            # print("Easy sign comparison (case 1)")
-            return True
-        elif self.get_sign() == "-ve" and other.get_sign() == "+ve":
-            # print("Easy sign comparison (case 2)")
-            return False
-
-        # Then the signs must be the same, and we will always arrive here...
-        fancy_truth = {"+ve": True, "-ve": False}
-
-        a = copy.copy(self).trim()
-        b = copy.copy(other).trim()
-        #
-        # if len(a.get_units()) > len(b.get_units()):
-        #     return fancy_truth[self.get_sign()]  # returns True if +ve and False if -ve
-        # elif len(a.get_units()) < len(b.get_units()):
-        #     return not fancy_truth[self.get_sign()]
-
-        len_diff = len(a.get_units()) - len(b.get_units())
-        zeros = [0] * abs(len_diff)
-
-        if len_diff > 0:
-            b.set_units(zeros + b.get_units())
-        elif len_diff < 0:
-            a.set_units(zeros + a.get_units())
-
-        # print(f"List 1: {a.get_units()}")
-        # print(f"List 2: {b.get_units()}")
-
-        # Compare digit by digit:
-        for i, j in zip(a.get_units(), b.get_units()):
-            if i > j:
-                # print(f"{i} > {j} !")
-                return fancy_truth[self.get_sign()]
-            elif j > i:
-                # print(f"{i} actually < {j} !")
-                return not fancy_truth[self.get_sign()]
-            # print(f"{i} not > {j}")
-
-        # equal units! Try the decimals...
-
-        len_diff = len(a.get_decs()) - len(b.get_decs())
-        zeros = [0] * abs(len_diff)
-
-        if len_diff > 0:
-            b.set_decs(b.get_decs() + zeros)
-        elif len_diff < 0:
-            a.set_decs(a.get_decs() + zeros)
-
-        # print(f"List 1: {a.get_decs()}")
-        # print(f"List 2: {b.get_decs()}")
-
-        for k, l in zip(a.get_decs(), b.get_decs()):
-            if k > l:
-                # print(f"{k} > {l} !")
-                return fancy_truth[self.get_sign()]
-            elif l > k:
-                # print(f"{k} actually < {l} !")
-                return not fancy_truth[self.get_sign()]
-            # print(f"{k} not > {l}")
-
-        # if we got here they must be equal.
-        # print("Got to the end so returning False")
-        return False
+    def _cut(self, precision: int):
+        """
+        Self cut off (towards zero) to `precision` digits in all, as a Glide's own precision
+        limits a quotient: the integer digits are always kept, and then as many decimal places
+        as the rest of the precision allows. A new Glide.
+        """
+        whole = max(limbs.num_digits(self._limbs) + self._exp, 1) if self._limbs else 1
+        places = max(precision - whole, 0)
 
-    def __lt__(self, other):
-        if self.get_sign() == "+ve" and other.get_sign() == "-ve":
-            # print("Easy sign comparison (case 1)")
-            return False
-        elif self.get_sign() == "-ve" and other.get_sign() == "+ve":
-            # print("Easy sign comparison (case 2)")
-            return True
-
-        # Then the signs must be the same, and we will always arrive here...
-        fancy_truth = {"+ve": False, "-ve": True}
-
-        a = copy.copy(self).trim()
-        b = copy.copy(other).trim()
-        #
-        # if len(a.get_units()) > len(b.get_units()):
-        #     return fancy_truth[self.get_sign()]  # returns True if +ve and False if -ve
-        # elif len(a.get_units()) < len(b.get_units()):
-        #     return not fancy_truth[self.get_sign()]
-
-        len_diff = len(a.get_units()) - len(b.get_units())
-        zeros = [0] * abs(len_diff)
-
-        if len_diff > 0:
-            b.set_units(zeros + b.get_units())
-        elif len_diff < 0:
-            a.set_units(zeros + a.get_units())
-
-        # print(f"List 1: {a.get_units()}")
-        # print(f"List 2: {b.get_units()}")
-
-        # Compare digit by digit:
-        for i, j in zip(a.get_units(), b.get_units()):
-            if i > j:
-                # print(f"{i} > {j} !")
-                return fancy_truth[self.get_sign()]
-            elif j > i:
-                # print(f"{i} actually < {j} !")
-                return not fancy_truth[self.get_sign()]
-            # print(f"{i} not > {j}")
-
-        # equal units! Try the decimals...
-
-        len_diff = len(a.get_decs()) - len(b.get_decs())
-        zeros = [0] * abs(len_diff)
-
-        if len_diff > 0:
-            b.set_decs(b.get_decs() + zeros)
-        elif len_diff < 0:
-            a.set_decs(a.get_decs() + zeros)
-
-        # print(f"List 1: {a.get_decs()}")
-        # print(f"List 2: {b.get_decs()}")
-
-        for k, l in zip(a.get_decs(), b.get_decs()):
-            if k > l:
-                # print(f"{k} > {l} !")
-                return fancy_truth[self.get_sign()]
-            elif l > k:
-                # print(f"{k} actually < {l} !")
-                return not fancy_truth[self.get_sign()]
-            # print(f"{k} not > {l}")
-
-        # if we got here they must be equal.
-        # print("Got to the end so returning False")
-        return False
+        if self._exp >= -places:
+            return Glide._from_packed(self._shared_limbs(), self._exp, self.get_sign() == "-ve")
 
-    def __ge__(self, other):
-        if self > other or self == other:
-            return True
-        else:
-            return False
+        buffer = limbs.shift_down(self._limbs, -places - self._exp)
 
-    def __le__(self, other):
-        if self < other or self == other:
-            return True
-        else:
-            return False
+        return Glide._from_packed(buffer, -places, self.get_sign() == "-ve" and bool(buffer)).trim()
 
-    def __add__(self, other):
-        a = copy.copy(self)
-        b = copy.copy(other)
+    def _round(self, sticky: bool = False):
+        """
+        Round self in place to the precision and rounding of the current context, if it has a
+        precision. `sticky` says the true value is a little bigger in magnitude than self.
+        """
+        ctx = getcontext()
+        if ctx.prec is None:
+            return self
 
-        if a.get_sign() == "-ve" and b.get_sign() == "-ve":
-            c = abs(a) + abs(b)
-            return -c
+        self._set_packed(*ctx.round(self._limbs, self._exp, self.get_sign() == "-ve", sticky))
 
-        elif a.get_sign() == "-ve" and b.get_sign() == "+ve":
-            return abs(b) - abs(a)
+        return self.trim()
 
-        elif a.get_sign() == "+ve" and b.get_sign() == "-ve":
-            return abs(a) - abs(b)
+    def __copy__(self):
+        """
+        Copies get their own limb buffer, so they're free to be worked on in place.
+        """
+        c = Glide._from_packed(limbs.new(self._limbs), self._exp, self._sign == "-ve")
+        c._precision = self._precision
+        c._private = True
 
-        len_diff = len(a.get_decs()) - len(b.get_decs())
-        zeros = [0] * abs(len_diff)
+        return c
 
-        if len_diff > 0:
-            b.set_decs(b.get_decs() + zeros)
-        elif len_diff < 0:
-            a.set_decs(a.get_decs() + zeros)
+    def __deepcopy__(self, memo):
+        return self.__copy__()
 
-        carry = 0
-        output_decs = []
+    def __reduce__(self):
+        return glide_from_bytes, (glide_to_bytes(self),)
 
-        for ai, bi in zip(reversed(a.get_decs()), reversed(b.get_decs())):
-            s = ai + bi + carry
-            output_decs.append(s % 10)
-            if s > 9:
-                carry = 1
-            else:
-                carry = 0
+    def __hash__(self):
+        """
+        Equal Glides hash equally: trailing zeros are moved into the exponent first, and zero
+        has no sign.
+        """
+        if not self._limbs:
+            return hash((b"", 0, False))
 
-        output_decs.reverse()
+        zeros = limbs.trailing_zeros(self._limbs)
+        buffer = limbs.shift_down(self._limbs, zeros) if zeros else self._limbs
 
-        len_diff = len(a.get_units()) - len(b.get_units())
-        zeros = [0] * abs(len_diff)
+        return hash((buffer.tobytes(), self._exp + zeros, self._sign == "-ve"))
 
-        if len_diff > 0:
-            b.set_units(zeros + b.get_units())
-        elif len_diff < 0:
-            a.set_units(zeros + a.get_units())
+    def _shared_limbs(self):
+        """
+        self's limb buffer, for another Glide to hold as well. From then on it isn't private, so
+        the next accumulate works on a copy of it.
+        """
+        if self._private:
+            self._private = False
 
-        output_units = []
+        return self._limbs
 
-        for ci, di in zip(reversed(a.get_units()), reversed(b.get_units())):
-            s = ci + di + carry
-            output_units.append(s % 10)
-            if s > 9:
-                carry = 1
-            else:
-                carry = 0
+    def __abs__(self):
+        return Glide._from_packed(self._shared_limbs(), self._exp)
 
-        if carry == 1:
-            output_units.append(1)
+    def __neg__(self):
+        if self.get_sign() not in ("+ve", "-ve"):
+            raise AttributeError(f"Glide didn't have a valid sign. ({self.get_sign()})")
 
-        output_units.reverse()
+        return Glide._from_packed(self._shared_limbs(), self._exp, self.get_sign() == "+ve")
 
-        x = Glide(1)
-        x.set_decs(output_decs)
-        x.set_units(output_units)
+    def _cmp(self, other) -> int:
+        """
+        Three-way comparison of the values of self and other: -1, 0 or 1. Zeros are equal
+        whatever their sign, trailing decimal zeros don't matter, and nothing gets copied or
+        padded along the way. The operators only call it for another Glide, and hand anything
+        else back to Python as NotImplemented, so mixed dicts and sets keep working.
+        """
+        if not self._limbs and not other._limbs:
+            return 0
 
-        return x
+        a_neg = self.get_sign() == "-ve" and bool(self._limbs)
+        b_neg = other.get_sign() == "-ve" and bool(other._limbs)
 
-    def __sub__(self, other):
-        a = copy.copy(self)
-        b = copy.copy(other)
+        if a_neg != b_neg:
+            return -1 if a_neg else 1
 
-        if a == b:
-            return Glide(0)
+        if self._exp <= other._exp:
+            c = limbs.cmp_shifted(self._limbs, other._limbs, other._exp - self._exp)
+        else:
+            c = -limbs.cmp_shifted(other._limbs, self._limbs, self._exp - other._exp)
 
-        if a.get_sign() == "-ve" and b.get_sign() == "-ve":
-            return abs(b) - abs(a)
+        return -c if a_neg else c
 
-        elif a.get_sign() == "+ve" and b.get_sign() == "-ve":
-            return abs(a) + abs(b)
+    def __eq__(self, other):
+        if not isinstance(other, Glide):
+            return NotImplemented
 
-        elif a.get_sign() == "-ve" and b.get_sign() == "+ve":
-            c = abs(a) + abs(b)
-            return -c
+        return self._cmp(other) == 0
 
-        if a < b:
-            c = b - a
-            return -c
+    def __ne__(self, other):
+        if not isinstance(other, Glide):
+            return NotImplemented
 
-        # actually do the subtraction. First need to do the subtraction over the decs...
+        return self._cmp(other) != 0
 
-        len_diff = len(a.get_decs()) - len(b.get_decs())
-        zeros = [0] * abs(len_diff)
+    def __gt__(self, other):
+        if not isinstance(other, Glide):
+            return NotImplemented
 
-        if len_diff > 0:
-            b.set_decs(b.get_decs() + zeros)
-        elif len_diff < 0:
-            a.set_decs(a.get_decs() + zeros)
+        return self._cmp(other) > 0
 
-        carry = 0
-        output_decs = []
+    def __lt__(self, other):
+        if not isinstance(other, Glide):
+            return NotImplemented
 
-        for ai, bi in zip(reversed(a.get_decs()), reversed(b.get_decs())):
-            s = ai - bi - carry
-            output_decs.append(s % 10)
-            if s < 0:
-                carry = 1
-            else:
-                carry = 0
+        return self._cmp(other) < 0
 
-        output_decs.reverse()
+    def __ge__(self, other):
+        if not isinstance(other, Glide):
+            return NotImplemented
 
-        len_diff = len(a.get_units()) - len(b.get_units())
-        zeros = [0] * abs(len_diff)
+        return self._cmp(other) >= 0
 
-        if len_diff > 0:
-            b.set_units(zeros + b.get_units())
-        elif len_diff < 0:
-            a.set_units(zeros + a.get_units())
+    def __le__(self, other):
+        if not isinstance(other, Glide):
+            return NotImplemented
 
-        output_units = []
+        return self._cmp(other) <= 0
 
-        for ci, di in zip(reversed(a.get_units()), reversed(b.get_units())):
-            s = ci - di - carry
-            output_units.append(s % 10)
-            if s < 0:
-                carry = 1
-            else:
-                carry = 0
+    def _add(self, other, negate: bool):
+        """
+        self + other (or - with negate) as a new Glide, rounded to the context. The signs decide
+        whether the magnitudes are added or the smaller taken from the bigger, so the result
+        is rounded just once, with its final sign.
+        """
+        # Line the limbs up on the decimal point, then add or subtract them with carries.
+        a_limbs, b_limbs, exp = self._aligned_limbs(other)
+        a_neg = self.get_sign() == "-ve"
+        b_neg = (other.get_sign() == "-ve") != negate
+
+        if a_neg == b_neg:
+            x = Glide._from_packed(limbs.add(a_limbs, b_limbs), exp, a_neg)
+        elif limbs.cmp(a_limbs, b_limbs) >= 0:
+            x = Glide._from_packed(limbs.sub(a_limbs, b_limbs), exp, a_neg)
+        else:
+            x = Glide._from_packed(limbs.sub(b_limbs, a_limbs), exp, b_neg)
 
-        output_units.reverse()
+        if not x._limbs:
+            return Glide._from_packed(x._limbs)
 
-        x = Glide(1)
-        x.set_decs(output_decs)
-        x.set_units(output_units)
-        if carry == 1:
-            x.set_sign("-ve")
+        return x._round()
 
-        return x
+    def __add__(self, other):
+        return self._add(other, False)
 
-    def __mul__(self, other):
-        a = copy.copy(self).trim().update_scientific()
-        b = copy.copy(other).trim().update_scientific()
+    def __sub__(self, other):
+        return self._add(other, True)
 
-        if len(a.get_mantissa()) < len(b.get_mantissa()):
-            return b * a
+    def _iadd(self, other, negate: bool):
+        """
+        self += other (or -= with negate), working in self's own limb buffer, which must not be
+        shared. Only a term with more decimal places than self forces a reallocation; otherwise
+        the term's limbs are added in at an offset, so the carries cost O(len(other)) however
+        long self is.
+        """
+        if self._exp > other._exp:
+            self._set_packed(limbs.shift_up(self._limbs, self._exp - other._exp), other._exp)
+
+        self._views = None  # the buffer is about to change under them
+        whole, part = divmod(other._exp - self._exp, limbs.DIGITS)
+        if part:
+            b_limbs = limbs.shift_up(other._limbs, part)
+        elif other is self:
+            b_limbs = limbs.new(other._limbs)
+        else:
+            b_limbs = other._limbs
 
-        # print(f"{a_list} \t with shift {a_shift}")
-        # print(f"{b_list} \t with shift {b_shift}")
-        # print("--------------")
+        self_neg = self.get_sign() == "-ve"
+        other_neg = (other.get_sign() == "-ve") != negate
 
-        table = []
+        if self_neg == other_neg:
+            limbs.iadd(self._limbs, b_limbs, whole)
+        elif limbs.cmp_shifted(self._limbs, b_limbs, whole * limbs.DIGITS) >= 0:
+            limbs.isub(self._limbs, b_limbs, whole)
+        else:
+            # the term is bigger, so the sign flips
+            self._limbs = limbs.sub(limbs.shift_up(b_limbs, whole * limbs.DIGITS), self._limbs)
+            self.set_sign("+ve" if self_neg else "-ve")
 
-        for e, bi in enumerate(reversed(b.get_mantissa())):
-            carry = 0
-            table.append([])
+        if not self._limbs:
+            self.set_sign("+ve")  # as with +, a sum that cancels out is plain zero
 
-            if e != 0:
-                table[e] += ([0] * e)
+        return self
 
-            for ai in reversed(a.get_mantissa()):
-                p = (ai * bi + carry)
-                table[e].append(p % 10)
+    def accumulate(self, other, subtract: bool = False):
+        """
+        Add other to self in place (or take it away, with subtract), rounded to the context as
+        + is, and return self. This is the way to keep a running total: it works in self's own
+        limb buffer, so unless other has more decimal places than self, a step costs
+        O(len(other)) rather than the O(len(self)) of building a new sum. Unlike +=, it changes
+        self, so it's only for a Glide the caller owns, such as a copy.copy made to hold the
+        total. Glides made from self with abs or - don't see the change: self's buffer is
+        copied first whenever one might be sharing it.
 
-                if p > 9:
-                    # print(f"Calculating carry... (p = {p})")
-                    carry = p // 10
-                else:
-                    carry = 0
+        Returns
+        -------
+        self: the updated Glide.
+        """
+        if not self._private:
+            self._limbs = limbs.new(self._limbs)  # the constants refuse here
+            self._private = True
 
-            shift = a.get_pow() + b.get_pow()  # work out the power of the result
+        return self._iadd(other, subtract)._round()
 
-            if carry != 0:
-                table[e].append(carry)
-                shift += 1
+    """
+    The in-place operators keep value semantics like everything else: another name may be holding
+    on to self, so x += y makes x a new Glide and leaves the old one as it was. A total that
+    should be worked on in place goes through accumulate instead.
+    """
 
-            table[e].reverse()
-            # print(table[e])
+    def __iadd__(self, other):
+        return copy.copy(self)._iadd(other, False)._round()
 
-        # print("--------------")
+    def __isub__(self, other):
+        return copy.copy(self)._iadd(other, True)._round()
 
-        # Now add the rows as Glides!
-        s = Glide(0)
+    def __imul__(self, other):
+        if other._exp or len(other._limbs) > 1:
+            x = self * other
+            x._precision = self._precision
+            return x
 
-        for i in table:
-            q = Glide(1)
-            q.set_units(i)
-            s += q
+        # a single limb multiplier can go straight through the copy's buffer
+        x = copy.copy(self)
+        limbs.imul_small(x._limbs, other._limbs[0] if other._limbs else 0)
+        x._views = None
+        x.set_sign("-ve" if self.get_sign() != other.get_sign() and x._limbs else "+ve")
 
-        s.set_mantissa(s.get_units())
-        s.set_pow(shift)
+        return x.trim()._round()
 
-        if a.get_sign() == b.get_sign():
-            return s.update_decimal()
-        else:
-            return -s.update_decimal()
+    def __mul__(self, other):
+        a = self
+        b = other
+
+        # With a working precision, digits far below it are cut off the operands first, so
+        # they never get multiplied out. Then it's the product of the packed integers, with
+        # the decimal places of both operands.
+        ctx = getcontext()
+        a_limbs, a_exp, a_cut = ctx.cut(a._limbs, a._exp)
+        b_limbs, b_exp, b_cut = ctx.cut(b._limbs, b._exp)
+        product, exp = limbs.mul(a_limbs, b_limbs), a_exp + b_exp
+        negative = a.get_sign() != b.get_sign() and bool(product)
+
+        if ctx.prec is not None:
+            # What was cut off adds less than a unit of the longer kept operand to the product.
+            # If that could take it over a rounding boundary, the product has to be exact.
+            error_digits = max(limbs.num_digits(a_limbs), limbs.num_digits(b_limbs)) + 1
+            if (a_cut or b_cut) and ctx.near_boundary(product, error_digits):
+                product, exp = limbs.mul(a._limbs, b._limbs), a._exp + b._exp
+                a_cut = b_cut = False
+
+            product, exp = ctx.round(product, exp, negative, a_cut or b_cut)
+
+        return Glide._from_packed(product, exp, negative).trim()
 
     def __divmod__(self, other):
-        a = copy.copy(self)
-        b = copy.copy(other)
+        a = self
+        b = other
 
-        if b == Glide(0):
+        if not b._limbs:
             raise ZeroDivisionError("can't divide by Glide(0.0).")
 
-        if a == b:
-            return Glide(1), Glide(0)
-
-        quot = Glide(0)
-        cum = Glide(0)
-
-        if a.get_sign() == b.get_sign():
-
-            while abs(cum) <= abs(a):
-                    quot += Glide(1)
-                    cum += b
+        # On a common exponent both are just integers, so long divide those.
+        a_limbs, b_limbs, exp = a._aligned_limbs(b)
+        q_limbs, r_limbs = limbs.divide(a_limbs, b_limbs)
 
-            return (quot-Glide(1)).trim(), (a+b-cum).trim()
+        if a.get_sign() != b.get_sign() and r_limbs:
+            # the quotient is floored, so it rounds away from zero and the remainder flips over
+            q_limbs = limbs.add(q_limbs, limbs.new([1]))
+            r_limbs = limbs.sub(b_limbs, r_limbs)
 
-        while abs(cum) < abs(a):
-            quot -= Glide(1)
-            cum -= b
+        quot = Glide._from_packed(q_limbs, 0, a.get_sign() != b.get_sign() and bool(q_limbs))
+        # the remainder takes the sign of the divisor
+        rem = Glide._from_packed(r_limbs, exp, b.get_sign() == "-ve" and bool(r_limbs))
 
-        return quot.trim(), (a-cum).trim()
+        return quot, rem.trim()
 
     def __floordiv__(self, other):
         return divmod(self, other)[0]
@@ -677,52 +627,196 @@ class Glide:
         return divmod(self, other)[1]
 
     def __truediv__(self, other):
+        if not other._limbs:
+            raise ZeroDivisionError("can't divide by Glide(0.0).")
+
         if self == other:
-            return Glide(1)
+            return Glide._from_packed(limbs.new([1]))
 
-        a = copy.copy(self)
-        b = copy.copy(other)
+        a = abs(self)
+        b = abs(other)
+        negative = self.get_sign() != other.get_sign()
 
         quot, rem = divmod(a, b)
-        if rem == Glide(0):
-            return quot  # if we're lucky we're done here!
+        if rem._limbs:
+            """
+            Otherwise we have to divide the remainder, until the precision limit is reached or
+            the division terminates. A Glide's own precision counts all of its digits; the
+            context's counts significant ones, and gets a couple of guard digits to round off.
+            """
+            ctx = getcontext()
+
+            if self.get_precision() is None and ctx.prec is not None:
+                if quot._limbs:
+                    places = ctx.prec + 2 - limbs.num_digits(quot._limbs)
+                else:
+                    places = ctx.prec + 2 + b.get_pow() - rem.get_pow()  # past the leading zeros
+            else:
+                if self.get_precision() is None:
+                    a_len = len(a.get_mantissa())
+                    b_len = len(b.get_mantissa())
+                    precision_limit = max([a_len, b_len]) + 1
+                else:
+                    precision_limit = self.get_precision()
+
+                places = precision_limit - quot.get_length() + 1
+                if quot.get_length() >= precision_limit:
+                    places = 0
+
+            if places > 0:
+                # Every decimal place the precision allows comes out of one division of the
+                # scaled-up remainder, which switches to Newton's reciprocal for long operands.
+                digits, rem = divmod(rem.left_shift(places), b)
+                quot._iadd(digits.right_shift(places), False)
+
+        if negative and quot._limbs:
+            quot.set_sign("-ve")
+
+        # only when the context picked the number of digits does the remainder round them off
+        return quot._round(sticky=bool(rem._limbs) and self.get_precision() is None)
 
+    def nthroot(self, k: int):
         """
-        Otherwise we have to divide the remainder, until the precision limit is reached or the 
-        division terminates.
+        The k-th root. If the Glide has its own precision, that limits the root as it does a
+        quotient: all of the root's integer digits, then as many decimal places as make up
+        the precision in all, cut off there (and then rounded to the context, if that has a
+        precision). Otherwise it's correctly rounded to the context's precision, in
+        significant digits, or with no context precision either, to one significant digit
+        more than the Glide has; exact roots come out exact.
+
+        The coefficient is scaled so its integer root has all the digits needed, and that's
+        taken by Newton's iteration on packed limbs (see limbs.root); whether it came out
+        exact is all the rounding needs to know about the rest of the digits.
+
+        Returns
+        -------
+        A new Glide. Odd roots of negative Glides are negative.
         """
+        if k < 1:
+            raise ValueError("Roots have to be of degree one or more")
+
+        negative = self.get_sign() == "-ve" and bool(self._limbs)
+        if negative and k % 2 == 0:
+            raise ValueError(f"Glide({self}) has no real root of even degree {k}")
+
+        if not self._limbs:
+            return Glide._from_packed(limbs.new())
+
+        ctx = getcontext()
+        prec = ctx.prec or len(self.get_mantissa()) + 1
+        coefficient, exp = self._limbs, self._exp
+
+        if self.get_precision() is not None:
+            # the root has (the Glide's adjusted exponent) // k + 1 integer digits, so this is
+            # how many decimal places the precision leaves it, and the scale brings them all
+            # into the integer root
+            whole = max((limbs.num_digits(coefficient) + exp - 1) // k + 1, 1)
+            places = max(self.get_precision() - whole, 0)
+            scale = exp + k * places
+            if scale >= 0:
+                coefficient = limbs.shift_up(coefficient, scale)
+            else:
+                coefficient = limbs.shift_down(coefficient, -scale)
+
+            root = Glide._from_packed(limbs.root(coefficient, k)[0], -places, negative)
+
+            return root.trim()._round()
 
-        if self.get_precision() is None:
-            a_len = len(a.get_mantissa())
-            b_len = len(b.get_mantissa())
-            precision_limit = max([a_len, b_len]) + 1
+        # scale = the power of ten the coefficient is brought to, to leave the root a digit more
+        # than prec to round off
+        scale = k * (prec + 1) - limbs.num_digits(coefficient)
+        scale += (exp - scale) % k
+
+        if scale >= 0:
+            cut = False
+            coefficient = limbs.shift_up(coefficient, scale)
         else:
-            precision_limit = self.get_precision()
+            cut = limbs.trailing_zeros(coefficient) < -scale
+            coefficient = limbs.shift_down(coefficient, -scale)
 
-        shift = 0
-        while quot.get_length() < precision_limit and rem != Glide(0):
+        root, exact = limbs.root(coefficient, k)
+        buffer, exp = Context(prec, ctx.rounding).round(root, (exp - scale) // k, negative,
+                                                         sticky=cut or not exact)
 
-            while rem < b:
-                shift += 1
-                rem.left_shift(1)
+        return Glide._from_packed(buffer, exp, negative).trim()
 
-            quot += (rem // b).right_shift(shift+1)
+    def sqrt(self):
+        """
+        The square root, rounded as in nthroot.
+        """
+        return self.nthroot(2)
 
-            if rem % b == Glide(0):
-                rem = Glide(0)
-            else:
-                rem = (rem % b)
+    def isqrt(self):
+        """
+        The integer part of the square root, exactly.
+        """
+        if self.get_sign() == "-ve" and self._limbs:
+            raise ValueError(f"Glide({self}) has no real square root")
 
-        return quot
+        if self._exp >= 0:
+            whole = limbs.shift_up(self._limbs, self._exp)
+        else:
+            whole = limbs.shift_down(self._limbs, -self._exp)
+
+        return Glide._from_packed(limbs.root(whole, 2)[0])
+
+
+class _Constant(Glide):
+    """
+    A Glide that can't be changed, for the interned constants.
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError("The Glide constants can't be changed, use a copy.copy of one instead")
+
+    def __reduce__(self):
+        return glide_from_string, (str(self),)
+
+
+def _constant(value: int) -> Glide:
+    g = Glide._from_packed(limbs.from_int(value))
+    g._views = {}  # it can't set one up itself once it's frozen
+    g.__class__ = _Constant
+
+    return g
+
+
+ZERO = _constant(0)
+ONE = _constant(1)
+TEN = _constant(10)
 
 
 def glide_from_int(num: int) -> Glide:
-    num_list = [int(a) for a in str(num)]
+    return Glide._from_packed(limbs.from_int(abs(num)), 0, num < 0)
 
-    output = Glide(1)
-    output.set_units(num_list)
+def glide_to_int(g: Glide) -> int:
+    """
+    The integer part of a Glide (truncated towards zero) as a Python int.
+    """
+    if g._exp >= 0:
+        num = limbs.to_int(limbs.shift_up(g._limbs, g._exp))
+    else:
+        num = limbs.to_int(limbs.shift_down(g._limbs, -g._exp))
+
+    return -num if g.get_sign() == "-ve" else num
+
+def glide_from_string(s) -> Glide:
+    """
+    Parse a decimal number like "-12.5" (str or bytes) straight into limbs, without going
+    through a list of digits.
+    """
+    if isinstance(s, bytes):
+        s = s.decode("ascii")
 
-    return output
+    s = s.strip()
+    negative = s.startswith("-")
+    units, _, decs = s.lstrip("+-").partition(".")
+
+    if not (units + decs).isascii() or not (units + decs).isdigit():
+        raise ValueError(f"Can't make sense of the input {s!r}")
+
+    return Glide._from_packed(limbs.from_str(units + decs), -len(decs), negative)
 
 def glide_to_string(g: Glide, raw: bool = True) -> str:
     """
@@ -738,47 +832,122 @@ def glide_to_string(g: Glide, raw: bool = True) -> str:
 
     """
     if raw:
-        return "".join([str(a) for a in g.get_units() + g.get_decs()])
+        units, decs = g._digit_strings()
+        return units + decs
+    else:
+        return str(g)
+
+"""
+The binary format of a Glide: a header of GLIDE_MAGIC, a flags byte (1 for negative, 2 if it
+has a precision), the exponent and the precision as signed 8 byte ints and the number of limbs
+as an unsigned one, all little-endian, then the limbs as 4 byte little-endian ints. That's
+the in-memory layout of the limbs on most machines, so they're written straight out of the
+buffer and read straight into a new one.
+"""
+GLIDE_MAGIC = b"GLIDEBIN"
+_GLIDE_HEADER = struct.Struct("<8sBqqQ")
+_NATIVE_LIMBS = limbs.new().itemsize == 4 and sys.byteorder == "little"
+
+
+def _glide_header(g: Glide) -> bytes:
+    flags = (g.get_sign() == "-ve") | (g.get_precision() is not None) << 1
+    return _GLIDE_HEADER.pack(GLIDE_MAGIC, flags, g._exp, g.get_precision() or 0, len(g._limbs))
+
+def _limb_bytes(buffer):
+    if _NATIVE_LIMBS:
+        return memoryview(buffer)
+
+    return b"".join(limb.to_bytes(4, "little") for limb in buffer)
+
+def _glide_from_header(header, buffer) -> Glide:
+    magic, flags, exp, precision, _ = _GLIDE_HEADER.unpack(header)
+    if magic != GLIDE_MAGIC:
+        raise ValueError("That isn't a binary Glide")
+
+    g = Glide._from_packed(buffer, exp, bool(flags & 1))
+    if flags & 2:
+        g.set_precision(precision)
+
+    return g
+
+def glide_to_bytes(g: Glide) -> bytes:
+    """
+    The compact binary form of a Glide: its limbs, sign, exponent and precision.
+    """
+    return _glide_header(g) + bytes(_limb_bytes(g._limbs))
+
+def glide_from_bytes(data) -> Glide:
+    """
+    A Glide from its binary form, in any bytes-like object (an mmap, say).
+    """
+    data = memoryview(data)
+    count = _GLIDE_HEADER.unpack(data[:_GLIDE_HEADER.size])[-1]
+    body = data[_GLIDE_HEADER.size:_GLIDE_HEADER.size + 4 * count]
+    if len(body) != 4 * count:
+        raise ValueError("The binary Glide is cut short")
+
+    buffer = limbs.new()
+    if _NATIVE_LIMBS:
+        buffer.frombytes(body)
     else:
-        if g.get_sign() == "-ve":
-            return "-".join([str(a) for a in g.get_units()]) + ".".join([str(a) for a in g.get_decs()])
+        buffer.extend(int.from_bytes(body[i:i + 4], "little") for i in range(0, len(body), 4))
+
+    return _glide_from_header(data[:_GLIDE_HEADER.size], buffer)
+
+def dump_glide(g: Glide, f) -> int:
+    """
+    Write a Glide's binary form to a binary file, straight from its limb buffer. Returns the
+    number of bytes written.
+    """
+    f.write(_glide_header(g))
+    f.write(_limb_bytes(g._limbs))
+
+    return _GLIDE_HEADER.size + 4 * len(g._limbs)
+
+def load_glide(f) -> Glide:
+    """
+    Read a Glide written by dump_glide from a binary file, straight into a new limb buffer.
+    """
+    header = f.read(_GLIDE_HEADER.size)
+    if len(header) != _GLIDE_HEADER.size:
+        raise ValueError("The binary Glide is cut short")
+
+    count = _GLIDE_HEADER.unpack(header)[-1]
+    if not _NATIVE_LIMBS:
+        return glide_from_bytes(header + f.read(4 * count))
+
+    buffer = limbs.new([0]) * count
+    if f.readinto(memoryview(buffer).cast("B")) != 4 * count:
+        raise ValueError("The binary Glide is cut short")
+
+    return _glide_from_header(header, buffer)
 
 
 def main() -> None:
+    from digitfile import DigitFile, write_digits
+    from scanner import scan_primes
+
     get_value = False
     if get_value == True:
+        from series import FileCheckpoint, compute_e
+
         precision = 2500
-        e = Glide(0)
+        write_digits("accurate_e.txt", compute_e(precision, FileCheckpoint("accurate_e.ckpt")))
 
-        for i in range(1000):
-            f = glide_from_int(factorial(i))
-            f.set_precision(precision)
-            e += Glide(1).set_precision(precision) / f
-            if i % 50 == 0:
-                print("-" * 10)
-                print(f"i: {i}...")
+    with DigitFile("accurate_e.txt") as accurate_e:
+        precision = len(accurate_e)
+        print("Successfully imported the value of e")
+        print("-" * 20)
 
-        accurate_e = glide_to_string(e)
-        with open("accurate_e.txt", "w") as f:
-            f.write(accurate_e)
+        # the first prime window comes early on, long before a process pool would pay off
+        hits = scan_primes(accurate_e, width=10, workers=1, limit=precision-1000)
 
-    else:
-        with open("accurate_e.txt", "r") as f:
-            accurate_e = f.read()
-            precision = len(accurate_e)
-            print("Successfully imported the value of e")
-            print("-" * 20)
-
-    for i in range(precision-1000):
-        n_to_check = accurate_e[i:i+10]
-        if i % 33 == 0:
-            print(f"Checking the number starting on the {i}th digit: {n_to_check}")
-        if isprime(int(n_to_check)):
-            print(f"{n_to_check} is the first prime we're interested in!")
-            break
-        if i % 33 == 0:
-            print("Not a prime.")
-            print("-" * 20)
+        if hits:
+            offset, _ = hits[0]
+            n_to_check = str(accurate_e.window(offset, 10), "ascii")
+            print(f"{n_to_check}, starting on the {offset}th digit, is the first prime we're interested in!")
+        else:
+            print("None of the numbers were prime.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for Glide arithmetic across operand sizes, with regression tracking.
+
+Every operation is timed on operands of each size (in decimal digits) for Glide, and for the
+decimal module and plain ints where they have a matching operation. The results can be written
+out as JSON, and compared against an earlier run's JSON to catch regressions:
+
+    python benchmark.py --out new.json
+    python benchmark.py --sizes 10,1000,100000 --baseline old.json
+
+When comparing, any Glide timing more than --threshold (as a fraction) slower than in the
+baseline is reported, and the exit status is 1.
+"""
+import argparse
+import decimal
+import json
+import platform
+import random
+import sys
+import time
+from typing import Callable, Optional
+
+from Main import glide_from_int
+from scanner import scan_primes
+from series import compute_e
+
+SIZES = (10, 100, 1000, 10 ** 4, 10 ** 5, 10 ** 6)
+OPERATIONS = ("add", "sub", "mul", "divmod", "truediv", "compare", "from_int", "str", "e", "scan")
+
+"""
+The slowest operations are only run up to these sizes (in digits) by default; --full lifts the
+caps. Every other operation runs at all the requested sizes.
+"""
+SIZE_LIMITS = {"e": 10 ** 5, "scan": 10 ** 5}
+
+
+def _random_int(digits: int, rng: random.Random) -> int:
+    return rng.randrange(10 ** (digits - 1), 10 ** digits)
+
+
+def _cases(op: str, digits: int, rng: random.Random) -> dict[str, Callable[[], object]]:
+    """
+    The timed callables for one operation at one size, keyed by implementation.
+    """
+    x = _random_int(digits, rng)
+    y = _random_int(max(digits // 2, 1) if op in ("divmod", "truediv") else digits, rng)
+
+    a, b = glide_from_int(x), glide_from_int(y)
+    ctx = decimal.Context(prec=2 * digits + 10, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+    da, db = ctx.create_decimal(x), ctx.create_decimal(y)
+
+    if op == "add":
+        return {"glide": lambda: a + b, "decimal": lambda: ctx.add(da, db), "int": lambda: x + y}
+    if op == "sub":
+        return {"glide": lambda: a - b, "decimal": lambda: ctx.subtract(da, db),
+                "int": lambda: x - y}
+    if op == "mul":
+        return {"glide": lambda: a * b, "decimal": lambda: ctx.multiply(da, db),
+                "int": lambda: x * y}
+    if op == "divmod":
+        return {"glide": lambda: divmod(a, b), "decimal": lambda: ctx.divmod(da, db),
+                "int": lambda: divmod(x, y)}
+    if op == "truediv":
+        # digits significant digits of the quotient; for ints that's a scaled floor division
+        a.set_precision(digits)
+        div_ctx = decimal.Context(prec=digits, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+        scale = 10 ** (digits - len(str(x // y)))
+        return {"glide": lambda: a / b, "decimal": lambda: div_ctx.divide(da, db),
+                "int": lambda: x * scale // y}
+    if op == "compare":
+        return {"glide": lambda: a < b, "decimal": lambda: da < db, "int": lambda: x < y}
+    if op == "from_int":
+        return {"glide": lambda: glide_from_int(x), "decimal": lambda: ctx.create_decimal(x)}
+    if op == "str":
+        # abs gives a new Glide on the same limbs each time, so the cached text isn't reused
+        return {"glide": lambda: str(abs(a)), "decimal": lambda: str(da), "int": lambda: str(x)}
+    if op == "e":
+        return {"glide": lambda: compute_e(digits)}
+    if op == "scan":
+        text = "".join(rng.choice("0123456789") for _ in range(digits))
+        return {"glide": lambda: scan_primes(text, width=10, first=False, workers=1)}
+
+    raise ValueError(f"There's no benchmark called {op!r}")
+
+
+def _time(fn: Callable[[], object], min_time: float, repeat: int) -> float:
+    """
+    Seconds per call: the best of `repeat` runs, each calling fn often enough to take min_time.
+    Calls taking over a second are only timed once, as the noise is small next to them.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(int(min_time / elapsed) + 1, 10))
+
+    best = elapsed / number
+    for _ in range(repeat - 1 if best < 1 else 0):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+
+    return best
+
+
+def run(sizes=SIZES, operations=OPERATIONS, min_time: float = 0.2, repeat: int = 3,
+        full: bool = False, seed: int = 0,
+        progress: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    Run the benchmarks.
+
+    Parameters
+    ----------
+    sizes : operand sizes in decimal digits.
+    operations : which of OPERATIONS to run.
+    min_time : the least time in seconds each timing run should take.
+    repeat : how many timing runs to take the best of.
+    full : run the operations in SIZE_LIMITS at every size too.
+    seed : seed for the random operands, so runs are comparable.
+    progress : called with a line of text after each timing, e.g. print.
+
+    Returns
+    -------
+    A JSON-ready dict: "meta" describes the machine, and "results"[op][size][implementation]
+    is the time per call in seconds (sizes are strings, as JSON needs).
+    """
+    rng = random.Random(seed)
+    results = {}
+
+    # the int and decimal baselines convert long strings, so the limit on their length is
+    # lifted while the timings run, and put back for the caller afterwards
+    max_str_digits = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    try:
+        for op in operations:
+            for digits in sizes:
+                if not full and digits > SIZE_LIMITS.get(op, digits):
+                    continue
+
+                for impl, fn in _cases(op, digits, rng).items():
+                    seconds = _time(fn, min_time, repeat)
+                    results.setdefault(op, {}).setdefault(str(digits), {})[impl] = seconds
+                    if progress:
+                        progress(f"{op:>9} {digits:>8} {impl:>8} {seconds:.3e} s")
+    finally:
+        sys.set_int_max_str_digits(max_str_digits)
+
+    meta = {"python": platform.python_version(), "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "min_time": min_time, "repeat": repeat}
+
+    return {"meta": meta, "results": results}
+
+
+def diff(current: dict, baseline: dict, threshold: float = 0.1,
+         impl: str = "glide") -> list[dict]:
+    """
+    Compare the `impl` timings of two runs. Returns one entry per (operation, size) the two have
+    in common, with the old and new times, their ratio and whether it's a regression (more
+    than `threshold` slower).
+    """
+    rows = []
+
+    for op, by_size in current["results"].items():
+        for size, timings in by_size.items():
+            old = baseline["results"].get(op, {}).get(size, {}).get(impl)
+            new = timings.get(impl)
+            if old is None or new is None:
+                continue
+
+            ratio = new / old
+            rows.append({"op": op, "size": int(size), "old": old, "new": new, "ratio": ratio,
+                         "regression": ratio > 1 + threshold})
+
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Glide arithmetic.")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="comma separated operand sizes in digits")
+    parser.add_argument("--ops", default=",".join(OPERATIONS),
+                        help="comma separated operations to run")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--full", action="store_true", help="ignore SIZE_LIMITS")
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this earlier JSON output")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown (as a fraction) that counts as a regression")
+    args = parser.parse_args(argv)
+
+    current = run([int(s) for s in args.sizes.split(",")], args.ops.split(","), args.min_time,
+                  args.repeat, args.full, progress=lambda line: print(line, flush=True))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as f:
+        rows = diff(current, json.load(f), args.threshold)
+
+    print("-" * 20)
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['op']:>9} {row['size']:>8} {row['old']:.3e} -> {row['new']:.3e} s "
+              f"({row['ratio']:.2f}x){flag}")
+
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+What the test modules share: a seeded random source, so failures repeat, and the helpers that
+make random operands and read Glides back as exact Fractions.
+"""
+import decimal
+import random
+from fractions import Fraction
+
+import pytest
+
+import limbs
+
+
+def random_limbs(r: random.Random, n: int):
+    return limbs.normalize(limbs.new(r.randrange(limbs.BASE) for _ in range(n)))
+
+
+def random_glide_text(r: random.Random) -> str:
+    whole = r.randrange(10 ** r.randrange(0, 30))
+    places = r.randrange(0, 30)
+    sign = r.choice(["", "-"])
+
+    return f"{sign}{whole}.{r.randrange(10 ** places):0{places}d}" if places else f"{sign}{whole}"
+
+
+def fraction(g) -> Fraction:
+    return Fraction(decimal.Decimal(str(g)))
+
+
+@pytest.fixture
+def r():
+    return random.Random(1234)
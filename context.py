@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+The arithmetic context: how many significant digits Glide arithmetic keeps, and how it rounds.
+
+Like the decimal module, every thread (and asyncio task) sees its own current context, which
+getcontext returns and localcontext swaps out for the length of a with block. With prec set,
++, -, *, / and the in-place operators round their results to prec significant digits, so the
+cost of each step of a long iterative computation stays put instead of growing with every
+operation. The default context has prec None: results are exact (apart from division, which
+falls back on the Glide's own precision), as they have always been. divmod, // and % are
+integer-style and stay exact.
+"""
+import contextvars
+from array import array
+from contextlib import contextmanager
+
+import limbs
+
+ROUND_DOWN = "ROUND_DOWN"  # towards zero
+ROUND_UP = "ROUND_UP"  # away from zero
+ROUND_CEILING = "ROUND_CEILING"  # towards +infinity
+ROUND_FLOOR = "ROUND_FLOOR"  # towards -infinity
+ROUND_HALF_UP = "ROUND_HALF_UP"  # to nearest, ties away from zero
+ROUND_HALF_DOWN = "ROUND_HALF_DOWN"  # to nearest, ties towards zero
+ROUND_HALF_EVEN = "ROUND_HALF_EVEN"  # to nearest, ties to an even last digit
+
+ROUNDING_MODES = (ROUND_DOWN, ROUND_UP, ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_UP, ROUND_HALF_DOWN,
+                  ROUND_HALF_EVEN)
+
+"""
+Operands of a product are cut down to prec + GUARD_DIGITS significant digits (a whole limb at a
+time) before multiplying, so the digits far below the working precision are never computed.
+That settles the rounding unless the cut product lies within about 10^-GUARD_DIGITS of a unit
+in the last place below a rounding boundary, where what was cut off might carry it across; only
+then is the product worked out again from the whole operands.
+"""
+GUARD_DIGITS = 18
+
+
+class Context:
+    """
+    Precision and rounding for Glide arithmetic.
+
+    ...
+
+    Attributes
+    ----------
+    prec: int or None. The number of significant digits results are rounded to, or None for
+          exact results.
+    rounding: str. One of the ROUND_* modes, ROUND_HALF_EVEN by default.
+
+    Methods
+    -------
+    round(buffer, exp, negative, sticky):
+        Round a packed value to the context.
+    cut(buffer, exp):
+        Drop the limbs of an operand that are too far down to matter to a rounded product.
+    near_boundary(buffer, error_digits):
+        Whether a value a little over buffer might round differently from it.
+    """
+
+    def __init__(self, prec: int = None, rounding: str = ROUND_HALF_EVEN):
+        if prec is not None and prec < 1:
+            raise ValueError("The precision has to be at least one digit")
+        if rounding not in ROUNDING_MODES:
+            raise ValueError(f"That's not a rounding mode! Use one of {', '.join(ROUNDING_MODES)}")
+
+        self.prec = prec
+        self.rounding = rounding
+
+    def __repr__(self):
+        return f"Context(prec={self.prec}, rounding={self.rounding})"
+
+    def copy(self):
+        return Context(self.prec, self.rounding)
+
+    def _round_away(self, negative: bool, odd: bool, digit: int, below: bool) -> bool:
+        """
+        Whether dropping digits rounds the magnitude up. `digit` is the first digit dropped and
+        `below` whether anything nonzero follows it.
+        """
+        inexact = digit or below
+        mode = self.rounding
+
+        if mode == ROUND_DOWN:
+            return False
+        if mode == ROUND_UP:
+            return bool(inexact)
+        if mode == ROUND_CEILING:
+            return bool(inexact) and not negative
+        if mode == ROUND_FLOOR:
+            return bool(inexact) and negative
+        if digit != 5:
+            return digit > 5
+        if below:
+            return True
+        if mode == ROUND_HALF_EVEN:
+            return odd
+
+        return mode == ROUND_HALF_UP
+
+    def round(self, buffer: array, exp: int, negative: bool,
+              sticky: bool = False) -> tuple[array, int]:
+        """
+        Round the value buffer * 10^exp to prec significant digits.
+
+        Parameters
+        ----------
+        buffer, exp : the packed magnitude.
+        negative : whether the value is negative, for the directed rounding modes.
+        sticky : whether the true magnitude is a little more than buffer * 10^exp, by less
+                 than a unit in the last place of buffer. Any digits down to prec + 1 that
+                 buffer doesn't have are taken to be zeros.
+
+        Returns
+        -------
+        (buffer, exp): the rounded magnitude.
+        """
+        drop = limbs.num_digits(buffer) - self.prec if self.prec is not None and buffer else 0
+
+        if sticky and buffer and drop < 1:
+            # the zeros that were trimmed off still count as digits before the sticky part
+            buffer = limbs.shift_up(buffer, 1 - drop)
+            exp -= 1 - drop
+            drop = 1
+
+        if drop > 0:
+            kept = limbs.shift_down(buffer, drop)
+            whole, part = divmod(drop - 1, limbs.DIGITS)
+            digit = buffer[whole] // 10 ** part % 10
+            below = sticky or limbs.trailing_zeros(buffer) < drop - 1
+
+            if self._round_away(negative, kept[0] % 2 == 1, digit, below):
+                kept = limbs.add(kept, limbs.new([1]))
+                if limbs.num_digits(kept) > self.prec:  # 99...9 rounded up to 100...0
+                    kept = limbs.shift_down(kept, 1)
+                    drop += 1
+
+            buffer, exp = kept, exp + drop
+
+        return buffer, exp
+
+    def cut(self, buffer: array, exp: int) -> tuple[array, int, bool]:
+        """
+        Drop whole limbs from the bottom of an operand, keeping at least prec + GUARD_DIGITS
+        significant digits. Returns the kept limbs, their exponent and whether anything nonzero
+        was dropped.
+        """
+        if self.prec is None:
+            return buffer, exp, False
+
+        keep = -(-(self.prec + GUARD_DIGITS) // limbs.DIGITS) + 1
+        drop = len(buffer) - keep
+        if drop <= 0:
+            return buffer, exp, False
+
+        return buffer[drop:], exp + drop * limbs.DIGITS, any(buffer[:drop])
+
+    def near_boundary(self, buffer: array, error_digits: int) -> bool:
+        """
+        Whether the true value, more than buffer by less than 10^error_digits units, might round
+        differently from buffer with sticky set: that is, whether a rounding boundary at prec
+        significant digits (a multiple of half a unit in the last place) could lie in between.
+        Only the dropped digits from error_digits up are looked at, so it's cheap however long
+        buffer is.
+        """
+        drop = limbs.num_digits(buffer) - self.prec
+        if drop <= error_digits:
+            return True
+
+        first, part = divmod(error_digits, limbs.DIGITS)
+        dropped = limbs.to_int(buffer[first:(drop - 1) // limbs.DIGITS + 1]) // 10 ** part
+        half = 5 * 10 ** (drop - 1 - error_digits)  # half a unit in the last place, at that scale
+
+        # below the last boundary by a whole 10^error_digits or more, it can't reach the next one
+        return dropped % half == half - 1
+
+
+_current = contextvars.ContextVar("glide_context")
+
+
+def getcontext() -> Context:
+    """
+    The current context. Each thread starts off with its own fresh, exact one.
+    """
+    try:
+        return _current.get()
+    except LookupError:
+        ctx = Context()
+        _current.set(ctx)
+        return ctx
+
+
+def setcontext(ctx: Context) -> None:
+    _current.set(ctx)
+
+
+@contextmanager
+def localcontext(ctx: Context = None, **kwargs):
+    """
+    Use a copy of ctx (by default the current context) as the current context inside a with
+    block, with any of its attributes overridden by keyword, e.g. localcontext(prec=50).
+    """
+    base = ctx or getcontext()
+    for name in kwargs:
+        if name not in ("prec", "rounding"):
+            raise TypeError(f"Contexts don't have a {name!r} attribute")
+
+    new = Context(kwargs.get("prec", base.prec), kwargs.get("rounding", base.rounding))
+
+    token = _current.set(new)
+    try:
+        yield new
+    finally:
+        _current.reset(token)
\ No newline at end of file
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Memory-mapped reading and streaming writing of files of decimal digits, like accurate_e.txt.
+
+Two formats are understood. Plain text is just the ASCII digits. The packed format is the
+header PACKED_MAGIC, the digit count as 8 little-endian bytes, then the digits as packed BCD,
+two to a byte (high nibble first, a zero nibble padding an odd count). Either way the file is
+mapped rather than read, so memory use doesn't depend on how many digits it holds.
+"""
+import mmap
+import os
+from typing import Iterable, Iterator, Union
+
+import limbs
+from Main import Glide
+
+PACKED_MAGIC = b"GLIDEBCD"
+_HEADER_SIZE = len(PACKED_MAGIC) + 8
+
+_TO_HIGH_NIBBLE = bytes.maketrans(b"0123456789", bytes(range(0, 160, 16)))
+_HIGH_TO_ASCII = bytes([48 + (b >> 4) for b in range(256)])
+_LOW_TO_ASCII = bytes([48 + (b & 15) for b in range(256)])
+
+
+def pack_bcd(digits: bytes) -> bytes:
+    """
+    ASCII digits to packed BCD. The high and low nibbles are translated separately and
+    combined with one big-int OR, so there's no per-digit Python loop.
+    """
+    if len(digits) % 2:
+        digits += b"0"
+
+    high = digits[0::2].translate(_TO_HIGH_NIBBLE)
+    low = digits[1::2].translate(limbs._TO_VALUES)
+
+    return (int.from_bytes(high, "big") | int.from_bytes(low, "big")).to_bytes(len(high), "big")
+
+
+def unpack_bcd(packed: bytes, count: int = None) -> bytes:
+    """
+    Packed BCD back to (the first `count`) ASCII digits.
+    """
+    out = bytearray(2 * len(packed))
+    out[0::2] = packed.translate(_HIGH_TO_ASCII)
+    out[1::2] = packed.translate(_LOW_TO_ASCII)
+
+    return bytes(out if count is None else out[:count])
+
+
+class DigitFile:
+    """
+    Read-only, memory-mapped access to a digit file, plain or packed.
+
+    ...
+
+    Methods
+    -------
+    window(start, width):
+        The digits start, ..., start + width - 1. For plain text files this is a zero-copy
+        memoryview into the mapping, which must be released before the file is closed.
+    chunks(size, start):
+        Iterate over the digits in blocks of `size`.
+    to_glide(units):
+        Load the digits into a Glide, with `units` digits before the decimal point.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+        self._packed = self._map[:len(PACKED_MAGIC)] == PACKED_MAGIC
+        if self._packed:
+            self._length = int.from_bytes(self._map[len(PACKED_MAGIC):_HEADER_SIZE], "little")
+        else:
+            self._length = size
+
+    def __len__(self):
+        return self._length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def is_packed(self) -> bool:
+        return self._packed
+
+    def window(self, start: int, width: int):
+        start = max(start, 0)
+        stop = min(start + width, self._length)
+        if stop <= start:
+            return b""
+
+        if not self._packed:
+            return memoryview(self._map)[start:stop]
+
+        first = _HEADER_SIZE + start // 2
+        last = _HEADER_SIZE + (stop + 1) // 2
+        digits = unpack_bcd(self._map[first:last])
+        offset = start % 2
+
+        return digits[offset:offset + stop - start]
+
+    def chunks(self, size: int = 1 << 20, start: int = 0) -> Iterator:
+        size += size % 2  # keeps packed reads on whole bytes
+        for i in range(start, self._length, size):
+            yield self.window(i, size)
+
+    def to_glide(self, units: int = None, block_limbs: int = 1 << 16) -> Glide:
+        """
+        Parse the digits straight into limbs a block at a time, from the least significant end,
+        without ever holding a list or string of the whole number.
+        """
+        n = self._length
+        units = n if units is None else units
+        block = block_limbs * limbs.DIGITS
+        out = limbs.new()
+
+        for stop in range(n, 0, -block):
+            start = max(stop - block, 0)
+            part = limbs.from_bytes(bytes(self.window(start, stop - start)))
+            if start:
+                part.frombytes(bytes((block_limbs - len(part)) * part.itemsize))
+            out.extend(part)
+
+        return Glide._from_packed(limbs.normalize(out), -max(n - units, 0)).trim()
+
+
+def _glide_chunks(g: Glide, chunk_limbs: int) -> Iterator[str]:
+    """
+    The raw digits of a Glide (as glide_to_string gives them), a block of limbs at a time.
+    """
+    buffer = g._limbs
+    scale = max(-g._exp, 0)
+    top = limbs.num_digits(buffer)
+
+    if not buffer:
+        yield "".join(g._digit_strings())
+        return
+
+    if scale >= top:
+        yield "0" * (scale + 1 - top)
+
+    for stop in range(len(buffer), 0, -chunk_limbs):
+        start = max(stop - chunk_limbs, 0)
+        text = limbs.to_str(buffer[start:stop])
+        yield text if stop == len(buffer) else text.rjust((stop - start) * limbs.DIGITS, "0")
+
+    block = chunk_limbs * limbs.DIGITS
+    for done in range(0, max(g._exp, 0), block):  # the zeros the exponent stands for
+        yield "0" * min(block, g._exp - done)
+
+    if scale == 0:
+        yield "0"
+
+
+def write_digits(path: Union[str, os.PathLike], source: Union[Glide, Iterable],
+                 packed: bool = False, chunk_limbs: int = 1 << 16) -> int:
+    """
+    Write digits to a file, streaming them rather than building one big string.
+
+    Parameters
+    ----------
+    path : where to write.
+    source : a Glide (its raw digits are written, as glide_to_string gives them), or any
+             iterable of str/bytes chunks of digits.
+    packed : whether to use the packed BCD format instead of plain text.
+    chunk_limbs : how many limbs of a Glide to format at a time.
+
+    Returns the number of digits written.
+    """
+    chunks = _glide_chunks(source, chunk_limbs) if isinstance(source, Glide) else source
+    count = 0
+    pending = b""
+
+    with open(path, "wb") as f:
+        if packed:
+            f.write(PACKED_MAGIC + bytes(8))
+
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("ascii")
+            count += len(chunk)
+
+            if not packed:
+                f.write(chunk)
+                continue
+
+            chunk = pending + chunk
+            even = len(chunk) - len(chunk) % 2
+            f.write(pack_bcd(chunk[:even]))
+            pending = chunk[even:]
+
+        if packed:
+            if pending:
+                f.write(pack_bcd(pending))
+            f.seek(len(PACKED_MAGIC))
+            f.write(count.to_bytes(8, "little"))
+
+    return count
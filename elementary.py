@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+Elementary functions of Glides: exp, log, sin, cos and atan, and the constants pi, e and ln 2.
+
+Each function works GUARD digits beyond the precision it's asked for and rounds once at the
+end. If the argument has its own precision, that limits the result as it does a quotient or a
+root: all of its integer digits and then as many decimal places as make up the precision in
+all, cut off there. Otherwise the result is rounded to the context's precision, or failing
+that to one significant digit more than the argument has. The constants take theirs as a
+parameter, or from the context.
+
+The series only ever see small arguments: exp reduces modulo ln 2 and then halves its
+argument a few times, squaring the result back up, and sin and cos reduce modulo pi/2 and
+then halve, using the double angle formulas. log and atan are Newton's iteration on exp and
+on sin/cos, doubling the working precision each step from a float estimate, so they cost a
+small multiple of the functions they invert. The constants are summed by binary splitting,
+and kept in a cache keyed by precision, so asking for one again at the same or a lower
+precision costs nothing.
+"""
+import copy
+import math
+
+import limbs
+from context import getcontext, localcontext
+from Main import ONE, ZERO, Glide, glide_from_int, glide_to_int
+from series import binary_split, e_terms
+
+GUARD = 10
+
+_cache = {}  # name -> (precision, value good to at least precision + GUARD digits)
+
+
+def _cached(name: str, precision: int, compute) -> Glide:
+    hit = _cache.get(name)
+    if hit is None or hit[0] < precision:
+        hit = _cache[name] = (precision, compute(precision + GUARD))
+
+    return hit[1]
+
+
+def _rounded(g: Glide, precision: int) -> Glide:
+    with localcontext(prec=precision):
+        return copy.copy(g)._round()
+
+
+def _result(compute, x: Glide) -> Glide:
+    """
+    compute(x, working precision) to the precision x asks for (see above).
+    """
+    if x.get_precision() is None:
+        precision = getcontext().prec or len(x.get_mantissa()) + 1
+        return _rounded(compute(_working(x), precision + GUARD), precision)
+
+    # enough significant digits for the decimal places, unless there are more integer digits
+    # than the precision allows, when they're all needed
+    digits = x.get_precision()
+    y = compute(_working(x), digits + GUARD)
+    if y.get_pow() + 1 > digits:
+        digits = y.get_pow() + 1
+        y = compute(_working(x), digits + GUARD)
+
+    return y._cut(x.get_precision())._round()
+
+
+def _constant_precision(precision: int) -> int:
+    precision = precision or getcontext().prec
+    if precision is None:
+        raise ValueError("Constants need a precision, either passed in or from the context")
+
+    return precision
+
+
+def _working(x: Glide) -> Glide:
+    """
+    A copy of x without its own precision, so that divisions by it go by the context.
+    """
+    return copy.copy(x).set_precision(None)
+
+
+def _precisions(precision: int) -> list[int]:
+    """
+    The working precisions of the Newton steps, smallest first: each about double the last.
+    """
+    out = [precision]
+    while out[-1] > 16:
+        out.append(out[-1] // 2 + 2)
+
+    return out[::-1]
+
+
+def _from_float(f: float) -> Glide:
+    digits, exp = f"{abs(f):.16e}".split("e")
+    g = Glide._from_packed(limbs.from_str(digits.replace(".", "")), int(exp) - 16, f < 0)
+
+    return g.trim()
+
+
+def _series_quotient(a, p, q, terms: int) -> Glide:
+    """
+    T / Q for the first `terms` terms of a series, as in series.sum_series, but divided at
+    the context's precision.
+    """
+    with localcontext(prec=None):
+        _, big_q, big_t = binary_split(a, p, q, 0, terms)
+
+    return big_t / big_q
+
+
+def _compute_pi(precision: int) -> Glide:
+    """
+    The Chudnovsky series: each term adds about 14 digits.
+    """
+    with localcontext(prec=precision):
+        sum_ = _series_quotient(lambda k: 13591409 + 545140134 * k,
+                                lambda k: -(6 * k - 5) * (2 * k - 1) * (6 * k - 1) if k else 1,
+                                lambda k: k ** 3 * 10939058860032000 if k else 1,
+                                precision // 14 + 2)
+
+        return glide_from_int(426880) * glide_from_int(10005).sqrt() / sum_
+
+
+def _atanh_inverse(m: int, precision: int) -> Glide:
+    """
+    atanh(1/m) = sum 1 / ((2n + 1) m^(2n + 1)).
+    """
+    terms = int(precision / (2 * math.log10(m))) + 2
+    sum_ = _series_quotient(lambda n: 1, lambda n: 2 * n - 1 if n else 1,
+                            lambda n: (2 * n + 1) * m * m if n else 1, terms)
+
+    return sum_ / glide_from_int(m)
+
+
+def _compute_ln2(precision: int) -> Glide:
+    with localcontext(prec=precision):
+        return (glide_from_int(18) * _atanh_inverse(26, precision)
+                - glide_from_int(2) * _atanh_inverse(4801, precision)
+                + glide_from_int(8) * _atanh_inverse(8749, precision))
+
+
+def _compute_e(precision: int) -> Glide:
+    with localcontext(prec=precision):
+        return _series_quotient(lambda n: 1, lambda n: 1, lambda n: n or 1, e_terms(precision))
+
+
+def pi(precision: int = None) -> Glide:
+    precision = _constant_precision(precision)
+    return _rounded(_cached("pi", precision, _compute_pi), precision)
+
+
+def ln2(precision: int = None) -> Glide:
+    precision = _constant_precision(precision)
+    return _rounded(_cached("ln2", precision, _compute_ln2), precision)
+
+
+def e(precision: int = None) -> Glide:
+    precision = _constant_precision(precision)
+    return _rounded(_cached("e", precision, _compute_e), precision)
+
+
+def _halvings(precision: int) -> int:
+    """
+    How many times to halve a series argument: each halving saves some terms of the series
+    but costs a squaring (or a double angle step) afterwards.
+    """
+    return math.isqrt(precision) // 2
+
+
+def _reduce(x: Glide, modulus: Glide) -> tuple[int, Glide]:
+    """
+    (k, r) with x = k * modulus + r and |r| <= modulus / 2.
+    """
+    k, r = divmod(x, modulus)
+    if r + r > modulus:
+        k, r = k + ONE, r - modulus
+
+    return glide_to_int(k), r
+
+
+def _exp(x: Glide, precision: int) -> Glide:
+    if x == ZERO:
+        return copy.copy(ONE)
+
+    # ln 2 needs the digits of x's integer part on top, to leave r good to precision places
+    with localcontext(prec=precision + max(x.get_pow(), 0)) as ctx:
+        k, r = _reduce(x, _cached("ln2", ctx.prec, _compute_ln2))
+
+    s = _halvings(precision)
+    with localcontext(prec=precision + s // 3 + 2):
+        r = r / glide_from_int(2 ** s)
+        total, term, n = copy.copy(ONE), copy.copy(ONE), 1
+        while True:
+            # terms only need digits down to the last place of the total
+            with localcontext(prec=max(precision + 2 + term.get_pow(), 1)):
+                term = term * r / glide_from_int(n)
+            if term == ZERO or term.get_pow() < -precision - 2:
+                break
+            total.accumulate(term)
+            n += 1
+
+        for _ in range(s):
+            total = total * total
+
+        if k >= 0:
+            return total * glide_from_int(2 ** k)
+
+        return total / glide_from_int(2 ** -k)
+
+
+def _sin_cos(x: Glide, precision: int) -> tuple[Glide, Glide]:
+    if x == ZERO:
+        return Glide._from_packed(limbs.new()), copy.copy(ONE)
+
+    # pi needs the digits of x's integer part on top, and more again if x is close to a
+    # multiple of pi/2 and most of them cancel (all of them, if r comes out as zero)
+    extra = max(x.get_pow(), 0)
+    while True:
+        with localcontext(prec=precision + extra) as ctx:
+            k, r = _reduce(x, _cached("pi", ctx.prec, _compute_pi) / glide_from_int(2))
+
+        lost = (-r.get_pow() if r != ZERO else ctx.prec) if k else 0
+        if lost <= extra - max(x.get_pow(), 0):
+            break
+        extra += lost
+
+    s = _halvings(precision)
+    with localcontext(prec=precision + s // 3 + 2):
+        r = r / glide_from_int(2 ** s)
+        sin, cos, term, n = copy.copy(r), copy.copy(ONE), r, 1
+        while True:
+            n += 1
+            with localcontext(prec=max(precision + 2 + term.get_pow() - r.get_pow(), 1)):
+                term = term * r / glide_from_int(n)
+            if term == ZERO or term.get_pow() < r.get_pow() - precision - 2:
+                break
+            if n % 4 == 0:
+                cos.accumulate(term)
+            elif n % 4 == 1:
+                sin.accumulate(term)
+            elif n % 4 == 2:
+                cos.accumulate(term, subtract=True)
+            else:
+                sin.accumulate(term, subtract=True)
+
+        two = glide_from_int(2)
+        for _ in range(s):
+            sin, cos = two * sin * cos, ONE - two * sin * sin
+
+    return [(sin, cos), (cos, -sin), (-sin, -cos), (-cos, sin)][k % 4]
+
+
+def _log(x: Glide, precision: int) -> Glide:
+    if x.get_sign() == "-ve" or x == ZERO:
+        raise ValueError(f"Only positive Glides have logs, not Glide({x})")
+
+    with localcontext(prec=None):
+        near = x - ONE
+    if near == ZERO:
+        return Glide._from_packed(limbs.new())
+
+    # close to 1, log x is about x - 1 and the Newton step loses the digits that cancel
+    extra = max(-near.get_pow(), 0)
+    if extra >= 8:
+        y = near
+    else:
+        digits = "".join(map(str, x.get_mantissa()[:17]))
+        y = _from_float(math.log(int(digits)) + (x.get_pow() - len(digits) + 1) * math.log(10))
+
+    for p in _precisions(precision):
+        with localcontext(prec=p + extra + 2):
+            y = y + x / _exp(y, p + extra) - ONE
+
+    return y
+
+
+def _atan(x: Glide, precision: int) -> Glide:
+    if x == ZERO:
+        return Glide._from_packed(limbs.new())
+
+    if x.get_sign() == "-ve":
+        return -_atan(-x, precision)
+
+    if x > ONE:
+        with localcontext(prec=precision):
+            half_pi = _cached("pi", precision, _compute_pi) / glide_from_int(2)
+            return half_pi - _atan(ONE / x, precision)
+
+    digits = "".join(map(str, x.get_mantissa()[:17]))
+    y = _from_float(math.atan(float(f"{digits}e{x.get_pow() - len(digits) + 1}")))
+
+    for p in _precisions(precision):
+        with localcontext(prec=p + 2):
+            sin, cos = _sin_cos(y, p)
+            y = y - (sin - x * cos) * cos
+
+    return y
+
+
+def exp(x: Glide) -> Glide:
+    return _result(_exp, x)
+
+
+def log(x: Glide) -> Glide:
+    """
+    The natural log.
+    """
+    return _result(_log, x)
+
+
+def sin(x: Glide) -> Glide:
+    return _result(lambda y, precision: _sin_cos(y, precision)[0], x)
+
+
+def cos(x: Glide) -> Glide:
+    return _result(lambda y, precision: _sin_cos(y, precision)[1], x)
+
+
+def atan(x: Glide) -> Glide:
+    return _result(_atan, x)
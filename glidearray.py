@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+"""
+Batched arithmetic on many fixed-precision Glides at once.
+
+A GlideArray keeps all of its values in one 2-D block of base 10^9 limbs, a row per value
+(least significant limb first, like a Glide's own buffer) with a common number of decimal
+places, plus an array of signs. Every operation is a handful of NumPy operations over the whole
+block: carries and borrows use the same segmented scan as limbs.add and limbs.sub, products
+are formed a column of limbs at a time, and division is Newton's reciprocal iteration run on
+every row together. Nothing loops over the values in Python except the conversions to and
+from lists of Glides.
+"""
+from typing import Iterable
+
+import limbs
+from Main import Glide
+
+np = None  # NumPy, imported by the first GlideArray
+
+BASE = limbs.BASE
+DIGITS = limbs.DIGITS
+
+
+def _widen(x, width: int):
+    """
+    Pad the rows of x with zero limbs at the most significant end, up to `width` limbs.
+    """
+    if x.shape[1] >= width:
+        return x
+
+    return np.pad(x, ((0, 0), (0, width - x.shape[1])))
+
+
+def _trim(x, keep: int):
+    """
+    Drop the most significant columns that are zero in every row, keeping at least `keep`.
+    """
+    used = np.flatnonzero(x.any(axis=0))
+    width = max(used[-1] + 1 if used.size else 0, keep)
+
+    return x[:, :width]
+
+
+def _add_rows(a, b):
+    width = max(a.shape[1], b.shape[1])
+    s = _widen(a, width) + _widen(b, width)
+
+    carries, carry_out = limbs._carry_in(s >= BASE, s == BASE - 1)
+    s += carries
+    s[s >= BASE] -= BASE
+
+    return np.concatenate([s, carry_out[:, None]], axis=1)
+
+
+def _sub_rows(a, b):
+    """
+    a - b row by row, for a >= b in every row.
+    """
+    width = max(a.shape[1], b.shape[1])
+    d = _widen(a, width) - _widen(b, width)
+
+    borrows, _ = limbs._carry_in(d < 0, d == 0)
+    d -= borrows
+    d[d < 0] += BASE
+
+    return d
+
+
+def _cmp_rows(a, b):
+    """
+    Three-way comparison of a and b row by row: an array of -1, 0 or 1.
+    """
+    width = max(a.shape[1], b.shape[1])
+    d = np.sign(_widen(a, width) - _widen(b, width))
+    top = width - 1 - np.argmax(d[:, ::-1] != 0, axis=1)  # the highest limb that differs
+
+    return d[np.arange(len(d)), top]
+
+
+def _mul_rows(a, b):
+    """
+    The full products of a and b row by row. Each column of a is multiplied into all of b at
+    once, split into low and high limbs so the running column sums stay well inside int64.
+    """
+    n, width = a.shape
+    acc = np.zeros((n, width + b.shape[1] + 1), dtype=np.int64)
+
+    for i in range(width):
+        p = a[:, i:i + 1] * b
+        acc[:, i:i + b.shape[1]] += p % BASE
+        acc[:, i + 1:i + b.shape[1] + 1] += p // BASE
+
+    for k in range(acc.shape[1] - 1):
+        c = acc[:, k] // BASE
+        acc[:, k] -= c * BASE
+        acc[:, k + 1] += c
+
+    return acc
+
+
+def _signed_add(a, a_neg, b, b_neg):
+    """
+    Signed sum of the (magnitude rows, negative flags) pairs a and b.
+    """
+    c = _cmp_rows(a, b)
+    bigger = (c >= 0)[:, None]
+    total = _add_rows(a, b)
+
+    width = total.shape[1]
+    a, b = _widen(a, width), _widen(b, width)
+    difference = _sub_rows(np.where(bigger, a, b), np.where(bigger, b, a))
+
+    same = a_neg == b_neg
+    mag = np.where(same[:, None], total, difference)
+    neg = np.where(same | (c >= 0), a_neg, b_neg) & mag.any(axis=1)
+
+    return mag, neg
+
+
+def _reciprocal_rows(b, k: int):
+    """
+    BASE^k / b for every row, to within a few units, for k > the width of b. The first 15 or
+    so digits come from a float estimate, and each Newton step y += y (BASE^k - b y) / BASE^k
+    then doubles the number of correct digits.
+    """
+    n, width = b.shape
+    rows = np.arange(n)
+    top = width - 1 - np.argmax(b[:, ::-1] != 0, axis=1)
+
+    padded = np.pad(b, ((0, 0), (2, 0))).astype(float)
+    lead = padded[rows, top + 2] * BASE + padded[rows, top + 1] + padded[rows, top] / BASE
+    estimate = np.floor(float(BASE) ** 3 / lead).astype(np.int64)  # between BASE and BASE^2
+
+    y = np.zeros((n, k + 1), dtype=np.int64)
+    y[rows, k - top - 2] = estimate % BASE
+    y[rows, k - top - 1] = estimate // BASE % BASE
+    y[rows, k - top] = estimate // BASE ** 2
+
+    one = np.zeros((n, k + 1), dtype=np.int64)
+    one[:, k] = 1
+    positive = np.zeros(n, dtype=bool)
+
+    correct = 15
+    while correct < DIGITS * (k + 1):
+        e, e_neg = _signed_add(one, positive, _mul_rows(b, y), ~positive)
+        y, _ = _signed_add(y, positive, _mul_rows(y, e)[:, k:], e_neg)
+        y = _trim(y, 1)
+        correct *= 2
+
+    return y
+
+
+def _divide_rows(a, b):
+    """
+    floor(a / b) row by row, for nonzero b: a * (BASE^k / b) gets within a few units of it,
+    and the last few are fixed up by stepping until a - q b lands in [0, b).
+    """
+    k = max(a.shape[1], b.shape[1]) + 1
+    q = _mul_rows(a, _reciprocal_rows(b, k))[:, k:]
+
+    n = len(a)
+    positive = np.zeros(n, dtype=bool)
+    r, r_neg = _signed_add(a, positive, _mul_rows(q, b), ~positive)
+
+    while True:
+        low = r_neg
+        high = ~r_neg & (_cmp_rows(r, b) >= 0)
+        if not (low.any() or high.any()):
+            return _trim(q, 1)
+
+        step = (low | high)[:, None]
+        unit = np.zeros((n, 1), dtype=np.int64)
+        unit[step] = 1
+
+        q, _ = _signed_add(q, positive, unit, low)
+        r, r_neg = _signed_add(r, r_neg, np.where(step, b, 0), high)
+
+
+class GlideArray:
+    """
+    Many fixed-precision Glides held in one contiguous block of limbs, with elementwise + - * /,
+    comparisons and reductions done on all of them at once.
+
+    ...
+
+    Attributes
+    ----------
+    values: iterable of Glides (or floats). The values to hold.
+    places: int. How many decimal places every value keeps, rounded up to a whole limb of nine.
+            Digits beyond that are truncated, by products and quotients too.
+
+    Methods
+    -------
+    to_glides():
+        The values as a list of Glides.
+    sum():
+        The sum of the values, as a Glide.
+    dot(other):
+        The sum of the elementwise products, as a Glide. The products are summed exactly and
+        truncated once at the end.
+    """
+
+    def __init__(self, values: Iterable = (), places: int = 18):
+        global np
+
+        np = limbs._numpy()
+        if np is None:
+            raise ImportError("GlideArray needs NumPy")
+
+        self._frac = -(-places // DIGITS)
+        scale = self._frac * DIGITS
+
+        buffers = []
+        negative = []
+        for v in values:
+            g = v if isinstance(v, Glide) else Glide(v)
+            if g._exp + scale >= 0:
+                buffers.append(limbs.shift_up(g._limbs, g._exp + scale))
+            else:
+                buffers.append(limbs.shift_down(g._limbs, -g._exp - scale))
+            negative.append(g.get_sign() == "-ve" and bool(buffers[-1]))
+
+        rows = np.zeros((len(buffers), max(map(len, buffers), default=0)), dtype=np.int64)
+        for i, buffer in enumerate(buffers):
+            rows[i, :len(buffer)] = np.frombuffer(buffer, dtype=np.uint32)
+
+        self._rows = _widen(rows, self._frac + 1)
+        self._negative = np.array(negative, dtype=bool)
+
+    @classmethod
+    def _from_rows(cls, rows, negative, frac: int):
+        out = cls.__new__(cls)
+        out._rows = _widen(_trim(rows, frac + 1), frac + 1)
+        out._negative = negative & rows.any(axis=1)
+        out._frac = frac
+
+        return out
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, i: int) -> Glide:
+        buffer = limbs.new()
+        buffer.frombytes(self._rows[i].astype(np.uint32).tobytes())
+
+        negative = bool(self._negative[i])
+
+        return Glide._from_packed(limbs.normalize(buffer), -self._frac * DIGITS, negative).trim()
+
+    def __repr__(self):
+        return f"GlideArray([{', '.join(str(g) for g in self.to_glides())}])"
+
+    def get_places(self) -> int:
+        return self._frac * DIGITS
+
+    def to_glides(self) -> list[Glide]:
+        return [self[i] for i in range(len(self))]
+
+    def _coerce(self, other):
+        """
+        Line other up with self: same number of rows (a single Glide is repeated) and the same
+        number of decimal places. Returns the rows and signs of both, and the common places.
+        """
+        if not isinstance(other, GlideArray):
+            other = GlideArray([other], self.get_places())
+
+        frac = max(self._frac, other._frac)
+        a = np.pad(self._rows, ((0, 0), (frac - self._frac, 0)))
+        b = np.pad(other._rows, ((0, 0), (frac - other._frac, 0)))
+        b_neg = other._negative
+
+        if len(b) == 1 and len(a) != 1:
+            b = np.repeat(b, len(a), axis=0)
+            b_neg = np.repeat(b_neg, len(a))
+        elif len(a) != len(b):
+            raise ValueError(f"Can't combine GlideArrays of lengths {len(a)} and {len(b)}")
+
+        return a, self._negative, b, b_neg, frac
+
+    def __add__(self, other):
+        a, a_neg, b, b_neg, frac = self._coerce(other)
+
+        return GlideArray._from_rows(*_signed_add(a, a_neg, b, b_neg), frac)
+
+    def __sub__(self, other):
+        a, a_neg, b, b_neg, frac = self._coerce(other)
+
+        return GlideArray._from_rows(*_signed_add(a, a_neg, b, ~b_neg), frac)
+
+    def __neg__(self):
+        return GlideArray._from_rows(self._rows, ~self._negative, self._frac)
+
+    def __abs__(self):
+        return GlideArray._from_rows(self._rows, np.zeros(len(self), dtype=bool), self._frac)
+
+    def __mul__(self, other):
+        a, a_neg, b, b_neg, frac = self._coerce(other)
+
+        # the product has twice the places, so the bottom frac limbs get truncated away
+        return GlideArray._from_rows(_mul_rows(a, b)[:, frac:], a_neg != b_neg, frac)
+
+    def __truediv__(self, other):
+        a, a_neg, b, b_neg, frac = self._coerce(other)
+
+        if not b.any(axis=1).all():
+            raise ZeroDivisionError("can't divide by Glide(0.0).")
+
+        quot = _divide_rows(np.pad(a, ((0, 0), (frac, 0))), b)
+
+        return GlideArray._from_rows(quot, a_neg != b_neg, frac)
+
+    def _cmp(self, other):
+        """
+        Three-way comparison of the values elementwise: an array of -1, 0 or 1.
+        """
+        a, a_neg, b, b_neg, _ = self._coerce(other)
+
+        # zeros are never flagged negative, so differing signs settle it on their own
+        c = _cmp_rows(a, b)
+
+        return np.where(a_neg != b_neg, np.where(a_neg, -1, 1), np.where(a_neg, -c, c))
+
+    def __eq__(self, other):
+        return self._cmp(other) == 0
+
+    def __ne__(self, other):
+        return self._cmp(other) != 0
+
+    def __gt__(self, other):
+        return self._cmp(other) > 0
+
+    def __lt__(self, other):
+        return self._cmp(other) < 0
+
+    def __ge__(self, other):
+        return self._cmp(other) >= 0
+
+    def __le__(self, other):
+        return self._cmp(other) <= 0
+
+    def _total(self, rows, negative, frac: int) -> Glide:
+        """
+        Add up all the rows by pairwise halving, so it's log2(n) batched adds.
+        """
+        while len(rows) > 1:
+            if len(rows) % 2:
+                rows = np.pad(rows, ((0, 1), (0, 0)))
+                negative = np.append(negative, False)
+
+            half = len(rows) // 2
+            rows, negative = _signed_add(rows[:half], negative[:half], rows[half:], negative[half:])
+
+        if not len(rows):
+            return Glide._from_packed(limbs.new())
+
+        return GlideArray._from_rows(rows, negative, frac)[0]
+
+    def sum(self) -> Glide:
+        return self._total(self._rows, self._negative, self._frac)
+
+    def dot(self, other) -> Glide:
+        a, a_neg, b, b_neg, frac = self._coerce(other)
+        total = self._total(_mul_rows(a, b), a_neg != b_neg, 2 * frac)
+
+        places = frac * DIGITS
+        if total._exp < -places:
+            total._set_packed(limbs.shift_down(total._limbs, -places - total._exp), -places)
+        if not total._limbs:
+            total.set_sign("+ve")
+
+        return total.trim()
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in instrumentation of Glide's operators, its conversions and the limb kernels under them.
+
+While it's enabled, every call is counted, along with how many limbs (nine digits each) went in
+and the wall time it took, and passed on to any callbacks registered for tracing. enable()
+swaps traced wrappers in for the real functions and disable() puts the originals back, so when
+it's off there's nothing in the way at all, not even a flag check, and it can be left in
+production code.
+
+Times are inclusive: an operator that calls other operators (__truediv__ calls divmod, for
+one) counts their time as well, and they're counted in their own right too. Kernels are only
+counted at the outermost call, so the recursion inside a multiplication isn't counted again.
+"""
+import functools
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+import limbs
+import Main
+from Main import Glide
+
+OPERATORS = ("__init__", "__copy__", "__hash__", "__str__", "__abs__", "__neg__", "__eq__",
+             "__ne__", "__gt__", "__lt__", "__ge__", "__le__", "__add__", "__sub__", "__iadd__",
+             "__isub__", "__imul__", "accumulate", "__mul__", "__divmod__", "__floordiv__",
+             "__mod__", "__truediv__", "nthroot", "sqrt", "isqrt", "left_shift", "right_shift",
+             "trim")
+CONVERSIONS = ("glide_from_int", "glide_to_int", "glide_from_string", "glide_to_string",
+               "glide_from_bytes", "glide_to_bytes")
+KERNELS = ("add", "sub", "iadd", "isub", "imul_small", "mul", "divide", "power", "root",
+           "shift_up", "shift_down", "from_int", "to_int", "from_str", "to_str")
+
+_stats = {}  # (group, name) -> [calls, seconds, limbs, max_limbs]
+_callbacks = []
+_patched = []  # (owner, name, original), to put back on disable
+_local = threading.local()
+
+
+def _size(args, result) -> int:
+    """
+    The number of limbs going into a call: its Glide and buffer arguments, or failing that
+    (conversions from ints and strings) what came out.
+    """
+    size = 0
+    for arg in args:
+        if isinstance(arg, Glide):
+            size += len(arg._limbs)
+        elif isinstance(arg, limbs.array):
+            size += len(arg)
+
+    if size == 0:
+        if isinstance(result, Glide):
+            size = len(result._limbs)
+        elif isinstance(result, limbs.array):
+            size = len(result)
+
+    return size
+
+
+def _record(group: str, name: str, seconds: float, size: int) -> None:
+    entry = _stats.get((group, name))
+    if entry is None:
+        entry = _stats[(group, name)] = [0, 0.0, 0, 0]
+
+    entry[0] += 1
+    entry[1] += seconds
+    entry[2] += size
+    entry[3] = max(entry[3], size)
+
+    if _callbacks:
+        event = {"group": group, "name": name, "seconds": seconds, "limbs": size}
+        for callback in _callbacks:
+            callback(event)
+
+
+def _traced(group: str, name: str, fn: Callable) -> Callable:
+    @functools.wraps(fn)
+    def traced(*args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        _record(group, name, time.perf_counter() - start, _size(args, result))
+        return result
+
+    return traced
+
+
+def _traced_kernel(name: str, fn: Callable) -> Callable:
+    @functools.wraps(fn)
+    def traced(*args, **kwargs):
+        if getattr(_local, "depth", 0):
+            return fn(*args, **kwargs)
+
+        _local.depth = 1
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            _local.depth = 0
+
+        _record("kernels", name, time.perf_counter() - start, _size(args, result))
+        return result
+
+    return traced
+
+
+def _patch(owner, name: str, wrapper: Callable) -> None:
+    _patched.append((owner, name, getattr(owner, name)))
+    setattr(owner, name, wrapper)
+
+
+def enabled() -> bool:
+    return bool(_patched)
+
+
+def enable() -> None:
+    """
+    Start counting. The conversions are also swapped out in any module that has already done
+    `from Main import glide_from_int` and the like.
+    """
+    if enabled():
+        return
+
+    for name in OPERATORS:
+        _patch(Glide, name, _traced("operators", name, getattr(Glide, name)))
+
+    for name in CONVERSIONS:
+        original = getattr(Main, name)
+        wrapper = _traced("conversions", name, original)
+        for module in list(sys.modules.values()):
+            if module is not None and vars(module).get(name) is original:
+                _patch(module, name, wrapper)
+
+    for name in KERNELS:
+        _patch(limbs, name, _traced_kernel(name, getattr(limbs, name)))
+
+
+def disable() -> None:
+    """
+    Stop counting, and put all the original functions back. The counts so far are kept.
+    """
+    while _patched:
+        owner, name, original = _patched.pop()
+        setattr(owner, name, original)
+
+
+@contextmanager
+def instrumented():
+    """
+    Count everything inside a with block.
+    """
+    was_enabled = enabled()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def reset() -> None:
+    _stats.clear()
+
+
+def add_callback(callback: Callable[[dict], None]) -> None:
+    """
+    Have callback called after every counted call, with a dict of its group ("operators",
+    "conversions" or "kernels"), name, seconds and limbs.
+    """
+    _callbacks.append(callback)
+
+
+def remove_callback(callback: Callable[[dict], None]) -> None:
+    _callbacks.remove(callback)
+
+
+def snapshot() -> dict:
+    """
+    The counts so far, as {group: {name: {"calls", "seconds", "limbs", "max_limbs",
+    "mean_limbs"}}}, plus whether instrumentation is on.
+    """
+    out = {"enabled": enabled(), "operators": {}, "conversions": {}, "kernels": {}}
+
+    for (group, name), (calls, seconds, size, max_size) in sorted(_stats.items()):
+        out[group][name] = {"calls": calls, "seconds": seconds, "limbs": size,
+                            "max_limbs": max_size, "mean_limbs": size / calls}
+
+    return out
+
+
+def to_json(indent: int = None) -> str:
+    return json.dumps(snapshot(), indent=indent)
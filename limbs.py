@@ -0,0 +1,1359 @@
+# -*- coding: utf-8 -*-
+"""
+Kernels for arithmetic on packed decimal limbs.
+
+A limb buffer is an array of unsigned ints, each holding nine decimal digits (base 10^9),
+least significant limb first. Buffers are kept normalised: there are no zero limbs at the
+most significant end, so zero is the empty buffer. Apart from the in-place i* kernels, none
+of them modify their inputs.
+"""
+import atexit
+import os
+from array import array
+
+np = None  # NumPy, once _numpy has imported it
+_numpy_tried = False
+
+BASE = 10 ** 9
+DIGITS = 9
+TYPECODE = "I" if array("I").itemsize >= 4 else "L"
+
+
+def new(values=()) -> array:
+    return array(TYPECODE, values)
+
+
+def normalize(a: array) -> array:
+    """
+    Drop zero limbs from the most significant end of `a` (in place).
+    """
+    while a and a[-1] == 0:
+        a.pop()
+
+    return a
+
+
+def from_str(s: str) -> array:
+    """
+    Parse a string of decimal digits, nine characters per limb.
+    """
+    s = "0" * (-len(s) % DIGITS) + s
+    out = new(map(int, [s[i:i + DIGITS] for i in range(len(s) - DIGITS, -1, -DIGITS)]))
+
+    return normalize(out)
+
+
+def to_str(a: array) -> str:
+    """
+    Format the buffer as decimal digits with a single %-format over all the limbs.
+    """
+    if not a:
+        return "0"
+
+    return ("%d" + "%09d" * (len(a) - 1)) % tuple(reversed(a))
+
+
+def from_bytes(b: bytes) -> array:
+    return from_str(b.decode("ascii"))
+
+
+def to_bytes(a: array) -> bytes:
+    return to_str(a).encode("ascii")
+
+
+_TO_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
+_TO_ASCII = bytes.maketrans(bytes(range(10)), b"0123456789")
+
+
+def from_digits(digits: list[int]) -> array:
+    return from_bytes(bytes(digits).translate(_TO_ASCII))
+
+
+def to_digits(a: array) -> list[int]:
+    return list(to_bytes(a).translate(_TO_VALUES))
+
+
+def str_to_digits(s: str) -> list[int]:
+    """
+    A string of decimal digits as a list of ints 0-9.
+    """
+    return list(s.encode("ascii").translate(_TO_VALUES))
+
+
+"""
+Conversion to and from Python ints is divide and conquer over cached powers (k and s below are
+powers of two). A buffer is cut at k limbs and the halves joined back with one multiply by
+BASE^k. An int is split with one divmod by BASE^k and the two halves' limbs are just laid end
+to end, but CPython's divmod is quadratic, so above INT_MUL_SPLIT_LIMBS an int is cut at s bits
+instead (a shift and a mask) and the halves' limbs joined back with one limb multiply by a
+cached buffer of 2^s. That goes through mul, NTT and all, so the conversion grows like a
+multiplication times the log of the length. Below INT_SPLIT_LIMBS limbs plain str/int
+conversion is used, which also keeps clear of the int max str digits limit.
+"""
+INT_SPLIT_LIMBS = 256
+INT_MUL_SPLIT_LIMBS = 16000
+
+_base_powers = {}
+_two_powers = {}
+
+
+def _base_power(k: int) -> int:
+    if k not in _base_powers:
+        _base_powers[k] = BASE ** k
+
+    return _base_powers[k]
+
+
+def _two_power(s: int) -> array:
+    """
+    The limbs of 2^s, for s a power of two, squared up from smaller ones.
+    """
+    if s not in _two_powers:
+        if s * 0.30103 / DIGITS <= INT_SPLIT_LIMBS:
+            _two_powers[s] = from_str(str(1 << s))
+        else:
+            half = _two_power(s // 2)
+            _two_powers[s] = mul(half, half)
+
+    return _two_powers[s]
+
+
+def to_int(a: array) -> int:
+    if len(a) <= INT_SPLIT_LIMBS:
+        return int(to_str(a))
+
+    k = 1 << ((len(a) - 1).bit_length() - 1)
+
+    return to_int(a[k:]) * _base_power(k) + to_int(normalize(a[:k]))
+
+
+def from_int(n: int) -> array:
+    """
+    Limbs of a non-negative int.
+    """
+    size = n.bit_length() * 0.30103 / DIGITS  # roughly the number of limbs
+    if size <= INT_SPLIT_LIMBS:
+        return from_str(str(n))
+
+    if size > INT_MUL_SPLIT_LIMBS:
+        s = 1 << ((n.bit_length() - 1).bit_length() - 1)
+
+        return add(mul(from_int(n >> s), _two_power(s)), from_int(n & ((1 << s) - 1)))
+
+    k = 1 << (int(size / 2).bit_length() - 1)
+    high, low = divmod(n, _base_power(k))
+
+    out = from_int(low)
+    out.frombytes(bytes((k - len(out)) * out.itemsize))  # pad the low half out to k limbs
+    out.extend(from_int(high))
+
+    return normalize(out)
+
+
+def num_digits(a: array) -> int:
+    """
+    Number of decimal digits in the integer held by `a`, counting zero as one digit.
+    """
+    if not a:
+        return 1
+
+    return (len(a) - 1) * DIGITS + len(str(a[-1]))
+
+
+def trailing_zeros(a: array) -> int:
+    """
+    Number of decimal zeros at the least significant end of `a` (0 for zero itself).
+    """
+    if not a:
+        return 0
+
+    i = 0
+    while a[i] == 0:
+        i += 1
+
+    limb = a[i]
+    count = i * DIGITS
+    while limb % 10 == 0:
+        limb //= 10
+        count += 1
+
+    return count
+
+
+def cmp(a: array, b: array) -> int:
+    """
+    Three-way comparison of two normalised buffers: -1, 0 or 1.
+    """
+    if len(a) != len(b):
+        return 1 if len(a) > len(b) else -1
+
+    for i in range(len(a) - 1, -1, -1):
+        if a[i] != b[i]:
+            return 1 if a[i] > b[i] else -1
+
+    return 0
+
+
+def cmp_shifted(a: array, b: array, k: int) -> int:
+    """
+    Three-way comparison of a with b * 10^k (k >= 0), without building the shifted buffer:
+    digit counts first, then limb by limb from the top, stopping at the first difference.
+    """
+    if k == 0:
+        return cmp(a, b)
+
+    if not a or not b:
+        return (len(a) > 0) - (len(b) > 0)
+
+    a_digits, b_digits = num_digits(a), num_digits(b) + k
+    if a_digits != b_digits:
+        return 1 if a_digits > b_digits else -1
+
+    whole, part = divmod(k, DIGITS)
+    low = 10 ** (DIGITS - part)
+    high = 10 ** part
+
+    for i in range(len(a) - 1, -1, -1):
+        j = i - whole
+        if part == 0:
+            limb = b[j] if 0 <= j < len(b) else 0
+        else:
+            upper = b[j] % low if 0 <= j < len(b) else 0
+            lower = b[j - 1] // low if 0 <= j - 1 < len(b) else 0
+            limb = upper * high + lower
+
+        if a[i] != limb:
+            return 1 if a[i] > limb else -1
+
+    return 0
+
+
+def _add_python(a: array, b: array) -> array:
+    if len(a) < len(b):
+        a, b = b, a
+
+    out = new(a)
+    carry = 0
+
+    for i in range(len(b)):
+        s = out[i] + b[i] + carry
+        if s >= BASE:
+            out[i] = s - BASE
+            carry = 1
+        else:
+            out[i] = s
+            carry = 0
+
+    i = len(b)
+    while carry and i < len(out):
+        if out[i] == BASE - 1:
+            out[i] = 0
+            i += 1
+        else:
+            out[i] += 1
+            carry = 0
+
+    if carry:
+        out.append(1)
+
+    return out
+
+
+def _sub_python(a: array, b: array) -> array:
+    out = new(a)
+    borrow = 0
+
+    for i in range(len(b)):
+        s = out[i] - b[i] - borrow
+        if s < 0:
+            out[i] = s + BASE
+            borrow = 1
+        else:
+            out[i] = s
+            borrow = 0
+
+    i = len(b)
+    while borrow:
+        if out[i] == 0:
+            out[i] = BASE - 1
+            i += 1
+        else:
+            out[i] -= 1
+            borrow = 0
+
+    return normalize(out)
+
+
+"""
+Addition and subtraction can also run on NumPy, as one vector add or subtract of the aligned
+limbs followed by a vectorised carry (or borrow) pass. A limb that overflows generates a carry,
+and a limb of BASE - 1 passes an incoming carry on (for borrows: a negative limb generates and
+a zero limb passes on), so the carry into each limb is decided by the nearest limb below it
+that doesn't pass carries on. That's found for every limb at once with a running maximum of
+indices, rather than by walking the limbs.
+
+BACKEND picks where add and sub run: "python", "numpy", or "auto" (NumPy, when it's installed,
+for operands of at least NUMPY_MIN_LIMBS limbs). Use set_backend to change it globally, or
+pass backend= to add/sub for a single call. NumPy's fixed cost per call is about 25-30 us, which
+the Python loop only overtakes at around 150-190 limbs, hence the threshold.
+"""
+BACKEND = "auto"
+NUMPY_MIN_LIMBS = 192
+
+
+def _numpy():
+    """
+    NumPy, or None if it isn't installed. It's imported the first time it's needed rather than
+    with this module, as it would be most of the time it takes to import Glide.
+    """
+    global np, _numpy_tried
+
+    if not _numpy_tried:
+        _numpy_tried = True
+        try:
+            import numpy as np
+        except ImportError:
+            pass
+
+    return np
+
+
+def set_backend(backend: str) -> None:
+    global BACKEND
+
+    if backend not in ("auto", "python", "numpy"):
+        raise ValueError("That's not a backend! Use 'auto', 'python' or 'numpy'")
+    if backend == "numpy" and (_numpy() is None or new().itemsize != 4):
+        raise ValueError("The numpy backend needs NumPy installed and 4 byte limbs")
+
+    BACKEND = backend
+
+
+def _use_numpy(backend: str, size: int) -> bool:
+    backend = backend or BACKEND
+    if backend == "auto":
+        return size >= NUMPY_MIN_LIMBS and new().itemsize == 4 and _numpy() is not None
+
+    return backend == "numpy" and _numpy() is not None
+
+
+def _to_np(a: array, size: int):
+    out = np.zeros(size, dtype=np.int64)
+    out[:len(a)] = np.frombuffer(a, dtype=np.uint32)
+
+    return out
+
+
+def _from_np(x) -> array:
+    out = new()
+    out.frombytes(x.astype(np.uint32).tobytes())
+
+    return normalize(out)
+
+
+def _carry_in(generate, passes):
+    """
+    For each limb, whether a carry arrives from below, plus the carry out of the top limb. The
+    limbs run along the last axis, so a 2-D block of rows is handled one row per number.
+    """
+    n = generate.shape[-1]
+    stops = np.where(passes, -1, np.arange(n))
+    last_stop = np.maximum.accumulate(stops, axis=-1)  # nearest limb at or below that stops
+
+    out = np.take_along_axis(generate, np.maximum(last_stop, 0), axis=-1) & (last_stop >= 0)
+    arrives = np.zeros(generate.shape[:-1] + (n + 1,), dtype=bool)
+    arrives[..., 1:] = out
+
+    return arrives[..., :-1], arrives[..., -1]
+
+
+def _add_numpy(a: array, b: array) -> array:
+    size = max(len(a), len(b))
+    s = _to_np(a, size) + _to_np(b, size)
+
+    carries, carry_out = _carry_in(s >= BASE, s == BASE - 1)
+    s += carries
+    s[s >= BASE] -= BASE
+
+    return _from_np(np.append(s, int(carry_out)))
+
+
+def _sub_numpy(a: array, b: array) -> array:
+    d = _to_np(a, len(a)) - _to_np(b, len(a))
+
+    borrows, _ = _carry_in(d < 0, d == 0)
+    d -= borrows
+    d[d < 0] += BASE
+
+    return _from_np(d)
+
+
+def add(a: array, b: array, backend: str = None) -> array:
+    if _use_numpy(backend, max(len(a), len(b))):
+        return _add_numpy(a, b)
+
+    return _add_python(a, b)
+
+
+def sub(a: array, b: array, backend: str = None) -> array:
+    """
+    a - b, for a >= b.
+    """
+    if _use_numpy(backend, len(a)):
+        return _sub_numpy(a, b)
+
+    return _sub_python(a, b)
+
+
+def iadd(acc: array, b: array, offset: int = 0) -> array:
+    """
+    acc += b * BASE^offset, in place. The carry stops as soon as it runs out, and acc only
+    grows when the sum is longer than it.
+    """
+    end = offset + len(b)
+    if len(acc) < end:
+        acc.frombytes(bytes((end - len(acc)) * acc.itemsize))
+
+    carry = 0
+    for i in range(len(b)):
+        s = acc[offset + i] + b[i] + carry
+        if s >= BASE:
+            acc[offset + i] = s - BASE
+            carry = 1
+        else:
+            acc[offset + i] = s
+            carry = 0
+
+    i = end
+    while carry:
+        if i == len(acc):
+            acc.append(1)
+            break
+        if acc[i] == BASE - 1:
+            acc[i] = 0
+            i += 1
+        else:
+            acc[i] += 1
+            carry = 0
+
+    return acc
+
+
+def isub(acc: array, b: array, offset: int = 0) -> array:
+    """
+    acc -= b * BASE^offset, in place, for acc >= b * BASE^offset.
+    """
+    borrow = 0
+    for i in range(len(b)):
+        s = acc[offset + i] - b[i] - borrow
+        if s < 0:
+            acc[offset + i] = s + BASE
+            borrow = 1
+        else:
+            acc[offset + i] = s
+            borrow = 0
+
+    i = offset + len(b)
+    while borrow:
+        if acc[i] == 0:
+            acc[i] = BASE - 1
+            i += 1
+        else:
+            acc[i] -= 1
+            borrow = 0
+
+    return normalize(acc)
+
+
+def imul_small(acc: array, m: int) -> array:
+    """
+    acc *= m, in place, for 0 <= m < BASE.
+    """
+    if m == 0:
+        del acc[:]
+        return acc
+
+    carry = 0
+    for i in range(len(acc)):
+        carry, acc[i] = divmod(acc[i] * m + carry, BASE)
+
+    if carry:
+        acc.append(carry)
+
+    return acc
+
+
+def mul_small(a: array, m: int) -> array:
+    """
+    a * m, for 0 <= m < BASE.
+    """
+    if not a or m == 0:
+        return new()
+
+    out = new()
+    carry = 0
+
+    for limb in a:
+        carry, r = divmod(limb * m + carry, BASE)
+        out.append(r)
+
+    if carry:
+        out.append(carry)
+
+    return out
+
+
+def divmod_small(a: array, d: int) -> tuple[array, int]:
+    """
+    (a // d, a % d), for 0 < d < BASE.
+    """
+    out = new(bytes(len(a) * new().itemsize))
+    r = 0
+
+    for i in range(len(a) - 1, -1, -1):
+        out[i], r = divmod(r * BASE + a[i], d)
+
+    return normalize(out), r
+
+
+def shift_up(a: array, k: int) -> array:
+    """
+    a * 10^k: whole limbs are prepended, and the remaining digits are a small multiply.
+    """
+    if not a or k == 0:
+        return new(a)
+
+    whole, part = divmod(k, DIGITS)
+    out = mul_small(a, 10 ** part) if part else new(a)
+
+    if whole:
+        out = new(bytes(whole * out.itemsize)) + out
+
+    return out
+
+
+def shift_down(a: array, k: int) -> array:
+    """
+    a // 10^k.
+    """
+    if not a or k == 0:
+        return new(a)
+
+    whole, part = divmod(k, DIGITS)
+    out = new(a[whole:])
+
+    if part:
+        out = divmod_small(out, 10 ** part)[0]
+
+    return normalize(out)
+
+
+def carry(columns: list[int]) -> array:
+    """
+    Turn a list of column sums (each possibly >= BASE) into a normalised limb buffer.
+    """
+    out = new()
+    c = 0
+
+    for x in columns:
+        c, r = divmod(c + x, BASE)
+        out.append(r)
+
+    while c:
+        c, r = divmod(c, BASE)
+        out.append(r)
+
+    return normalize(out)
+
+
+def mul_schoolbook(a: array, b: array) -> array:
+    """
+    Schoolbook product of two buffers.
+    """
+    if not a or not b:
+        return new()
+
+    if len(a) < len(b):
+        a, b = b, a
+
+    columns = [0] * (len(a) + len(b))
+    b_list = b.tolist()
+
+    for i, ai in enumerate(a):
+        if ai == 0:
+            continue
+        for j, bj in enumerate(b_list, i):
+            columns[j] += ai * bj
+
+    return carry(columns)
+
+
+def _accumulate(parts: list[tuple[int, array]], size: int) -> array:
+    """
+    Sum buffers placed at limb offsets, with one carry pass at the end.
+    """
+    columns = [0] * size
+
+    for offset, part in parts:
+        for i, limb in enumerate(part, offset):
+            columns[i] += limb
+
+    return carry(columns)
+
+
+def _signed_add(x: tuple[bool, array], y: tuple[bool, array]) -> tuple[bool, array]:
+    """
+    Add two (negative, magnitude) pairs, for the signed intermediate values in Toom-3.
+    """
+    (x_neg, x_mag), (y_neg, y_mag) = x, y
+
+    if x_neg == y_neg:
+        return x_neg, add(x_mag, y_mag)
+
+    if cmp(x_mag, y_mag) >= 0:
+        return x_neg, sub(x_mag, y_mag)
+
+    return y_neg, sub(y_mag, x_mag)
+
+
+def _signed_sub(x: tuple[bool, array], y: tuple[bool, array]) -> tuple[bool, array]:
+    return _signed_add(x, (not y[0], y[1]))
+
+
+def _signed_mul(x: tuple[bool, array], y: tuple[bool, array]) -> tuple[bool, array]:
+    return x[0] != y[0], mul(x[1], y[1])
+
+
+def _signed_div_small(x: tuple[bool, array], d: int) -> tuple[bool, array]:
+    """
+    Exact division of a signed value by a small d.
+    """
+    return x[0], divmod_small(x[1], d)[0]
+
+
+def _mul_unbalanced(a: array, b: array) -> array:
+    """
+    Product for len(a) much larger than len(b): cut a into pieces the size of b, so each
+    sub-product is balanced.
+    """
+    n = len(b)
+    parts = [(i, mul(normalize(a[i:i + n]), b)) for i in range(0, len(a), n)]
+
+    return _accumulate(parts, len(a) + len(b))
+
+
+def mul_karatsuba(a: array, b: array) -> array:
+    """
+    Karatsuba product: three half-size products instead of four.
+    """
+    m = (max(len(a), len(b)) + 1) // 2
+    a0, a1 = normalize(a[:m]), a[m:]
+    b0, b1 = normalize(b[:m]), b[m:]
+
+    z0 = mul(a0, b0)
+    z2 = mul(a1, b1)
+    z1 = sub(sub(mul(add(a0, a1), add(b0, b1)), z0), z2)
+
+    return _accumulate([(0, z0), (m, z1), (2 * m, z2)], len(a) + len(b))
+
+
+def mul_toom3(a: array, b: array) -> array:
+    """
+    Toom-Cook 3-way product: split into thirds, evaluate at 0, 1, -1, -2 and infinity, make
+    five third-size products and interpolate (Bodrato's sequence).
+    """
+    return _toom3(a, b, lambda pairs: [_signed_mul(x, y) for x, y in pairs])
+
+
+def _toom3(a: array, b: array, products) -> array:
+    """
+    Toom-3 with the five pointwise products made by products(pairs), which takes a list of
+    pairs of signed values and returns their signed products.
+    """
+    k = (max(len(a), len(b)) + 2) // 3
+
+    def evaluate(x: array) -> list[tuple[bool, array]]:
+        x0, x1, x2 = (False, normalize(x[:k])), (False, normalize(x[k:2 * k])), (False, x[2 * k:])
+        x02 = _signed_add(x0, x2)
+        p1 = _signed_add(x02, x1)
+        pm1 = _signed_sub(x02, x1)
+        pm2 = _signed_sub(_signed_add(pm1, x2), x0)
+        pm2 = (pm2[0], mul_small(pm2[1], 2))
+        pm2 = _signed_add(pm2, x0)
+        return [x0, p1, pm1, pm2, x2]
+
+    r0, r1, rm1, rm2, r_inf = products(list(zip(evaluate(a), evaluate(b))))
+
+    c3 = _signed_div_small(_signed_sub(rm2, r1), 3)
+    c1 = _signed_div_small(_signed_sub(r1, rm1), 2)
+    c2 = _signed_sub(rm1, r0)
+    c3 = _signed_add(_signed_div_small(_signed_sub(c2, c3), 2), (r_inf[0], mul_small(r_inf[1], 2)))
+    c2 = _signed_sub(_signed_add(c2, c1), r_inf)
+    c1 = _signed_sub(c1, c3)
+
+    # All five coefficients of the product are non-negative.
+    parts = [(0, r0[1]), (k, c1[1]), (2 * k, c2[1]), (3 * k, c3[1]), (4 * k, r_inf[1])]
+
+    return _accumulate(parts, len(a) + len(b) + 1)
+
+
+"""
+Number-theoretic transform multiplication. The limbs are convolved exactly modulo NTT-friendly
+primes (p = c * 2^k + 1), so the column sums come back before the usual carry pass. With
+NumPy the transforms run modulo three primes below 2^30, so every product fits in an int64,
+and the columns are recovered by CRT. The pure Python fallback instead uses one 89-bit prime,
+which is big enough on its own and needs a third of the transforms.
+"""
+NTT_PRIMES = ((998244353, 3), (167772161, 3), (469762049, 3))  # (p, primitive root)
+NTT_WIDE_PRIME = (309485009821345069664305153, 5)
+NTT_MAX_LENGTH = 1 << 23  # the largest power of two dividing every p - 1
+
+_twiddle_cache = {}
+
+
+def _twiddles(p: int, g: int, n: int, inverse: bool) -> list[int]:
+    """
+    Powers w^0 .. w^(n/2 - 1) of a primitive nth root of unity mod p (or of its inverse).
+    Smaller stages use every (n/2h)th entry of this table.
+    """
+    key = (p, n, inverse)
+    if key not in _twiddle_cache:
+        w = pow(g, (p - 1) // n, p)
+        if inverse:
+            w = pow(w, p - 2, p)
+
+        table = [1] * (n // 2)
+        for j in range(1, n // 2):
+            table[j] = table[j - 1] * w % p
+
+        _twiddle_cache[key] = table
+
+    return _twiddle_cache[key]
+
+
+def _ntt_forward(a: list[int], p: int, g: int) -> None:
+    """
+    In-place decimation-in-frequency transform: natural order in, bit-reversed order out.
+    Each stage works on whole slices, looping over whichever of blocks or butterfly offsets
+    there are fewer of.
+    """
+    n = len(a)
+    table = _twiddles(p, g, n, False)
+    h = n // 2
+
+    while h:
+        step = 2 * h
+        tw = table[::n // step]
+
+        if h >= n // step:
+            for s in range(0, n, step):
+                u, v = a[s:s + h], a[s + h:s + step]
+                a[s:s + h] = [(x + y) % p for x, y in zip(u, v)]
+                a[s + h:s + step] = [(x - y) * w % p for x, y, w in zip(u, v, tw)]
+        else:
+            for j in range(h):
+                u, v, w = a[j::step], a[j + h::step], tw[j]
+                a[j::step] = [(x + y) % p for x, y in zip(u, v)]
+                a[j + h::step] = [(x - y) * w % p for x, y in zip(u, v)]
+
+        h //= 2
+
+
+def _ntt_inverse(a: list[int], p: int, g: int) -> None:
+    """
+    In-place decimation-in-time inverse transform: bit-reversed order in, natural order out,
+    including the division by n.
+    """
+    n = len(a)
+    table = _twiddles(p, g, n, True)
+    h = 1
+
+    while h < n:
+        step = 2 * h
+        tw = table[::n // step]
+
+        if h >= n // step:
+            for s in range(0, n, step):
+                u = a[s:s + h]
+                v = [y * w % p for y, w in zip(a[s + h:s + step], tw)]
+                a[s:s + h] = [(x + y) % p for x, y in zip(u, v)]
+                a[s + h:s + step] = [(x - y) % p for x, y in zip(u, v)]
+        else:
+            for j in range(h):
+                w = tw[j]
+                u = a[j::step]
+                v = [y * w % p for y in a[j + h::step]]
+                a[j::step] = [(x + y) % p for x, y in zip(u, v)]
+                a[j + h::step] = [(x - y) % p for x, y in zip(u, v)]
+
+        h *= 2
+
+    n_inv = pow(n, p - 2, p)
+    a[:] = [x * n_inv % p for x in a]
+
+
+def _convolve_mod(a: array, b: array, p: int, g: int, n: int) -> list[int]:
+    fa = a.tolist() + [0] * (n - len(a))
+    _ntt_forward(fa, p, g)
+
+    if b is a:
+        fb = fa
+    else:
+        fb = b.tolist() + [0] * (n - len(b))
+        _ntt_forward(fb, p, g)
+
+    prod = [x * y % p for x, y in zip(fa, fb)]
+    _ntt_inverse(prod, p, g)
+
+    return prod
+
+
+def _ntt_forward_np(a, p: int, g: int) -> None:
+    n = len(a)
+    table = np.array(_twiddles(p, g, n, False), dtype=np.int64)
+    h = n // 2
+
+    while h:
+        blocks = a.reshape(-1, 2, h)
+        u, v = blocks[:, 0, :].copy(), blocks[:, 1, :].copy()
+        tw = table[::n // (2 * h)]
+        blocks[:, 0, :] = (u + v) % p
+        blocks[:, 1, :] = (u - v) % p * tw % p
+        h //= 2
+
+
+def _ntt_inverse_np(a, p: int, g: int) -> None:
+    n = len(a)
+    table = np.array(_twiddles(p, g, n, True), dtype=np.int64)
+    h = 1
+
+    while h < n:
+        blocks = a.reshape(-1, 2, h)
+        tw = table[::n // (2 * h)]
+        u, v = blocks[:, 0, :].copy(), blocks[:, 1, :] * tw % p
+        blocks[:, 0, :] = (u + v) % p
+        blocks[:, 1, :] = (u - v) % p
+        h *= 2
+
+    a *= pow(n, p - 2, p)
+    a %= p
+
+
+def _convolve_mod_np(a: array, b: array, p: int, g: int, n: int):
+    fa = np.zeros(n, dtype=np.int64)
+    fa[:len(a)] = np.frombuffer(a, dtype=np.uint32) if a.itemsize == 4 else a.tolist()
+    _ntt_forward_np(fa, p, g)
+
+    if b is a:
+        fb = fa
+    else:
+        fb = np.zeros(n, dtype=np.int64)
+        fb[:len(b)] = np.frombuffer(b, dtype=np.uint32) if b.itemsize == 4 else b.tolist()
+        _ntt_forward_np(fb, p, g)
+
+    prod = fa * fb % p
+    _ntt_inverse_np(prod, p, g)
+
+    return prod
+
+
+def _crt_columns(r1, r2, r3) -> list[int]:
+    """
+    Garner's algorithm: rebuild each column sum from its residues mod the three NTT_PRIMES.
+    Every intermediate product stays below 2^60, so it's all done in int64.
+    """
+    (p1, _), (p2, _), (p3, _) = NTT_PRIMES
+    p1_inv = pow(p1, p2 - 2, p2)
+    p12_inv = pow(p1 * p2 % p3, p3 - 2, p3)
+
+    c1 = (r2 - r1) % p2 * p1_inv % p2
+    c2 = ((r3 - r1) % p3 - p1 % p3 * c1 % p3) % p3 * p12_inv % p3
+
+    return [x + p1 * (y + p2 * z) for x, y, z in zip(r1.tolist(), c1.tolist(), c2.tolist())]
+
+
+def mul_ntt(a: array, b: array) -> array:
+    """
+    Product of two buffers by NTT convolution. Uses NumPy over NTT_PRIMES (recombined with CRT)
+    when it's installed, and pure Python over NTT_WIDE_PRIME otherwise.
+    """
+    if not a or not b:
+        return new()
+
+    size = len(a) + len(b) - 1
+    n = 1 << (size - 1).bit_length()
+    if n > NTT_MAX_LENGTH:
+        raise ValueError(f"Operands too long for the NTT ({size} limbs, max {NTT_MAX_LENGTH}).")
+
+    if _numpy() is None:
+        return carry(_convolve_mod(a, b, *NTT_WIDE_PRIME, n)[:size])
+
+    residues = [_convolve_mod_np(a, b, p, g, n)[:size] for p, g in NTT_PRIMES]
+
+    return carry(_crt_columns(*residues))
+
+
+"""
+Operand lengths (in limbs of the shorter operand) at which mul switches algorithm. These can
+be tuned by assigning to them, e.g. limbs.KARATSUBA_THRESHOLD = 80.
+"""
+KARATSUBA_THRESHOLD = 56
+TOOM3_THRESHOLD = 150
+NTT_THRESHOLD = 500
+
+
+def mul(a: array, b: array) -> array:
+    """
+    Product of two buffers, picking schoolbook, Karatsuba, Toom-3 or the NTT from the operand
+    lengths.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+
+    n = len(b)
+
+    if n < KARATSUBA_THRESHOLD:
+        return mul_schoolbook(a, b)
+
+    if PARALLEL_WORKERS > 1 and n >= PARALLEL_THRESHOLD and 2 * n > len(a) and not _in_worker:
+        return mul_parallel(a, b)
+
+    if n >= NTT_THRESHOLD and len(a) + n <= NTT_MAX_LENGTH:
+        return mul_ntt(a, b)
+
+    if 2 * n <= len(a):
+        return _mul_unbalanced(a, b)
+
+    if n < TOOM3_THRESHOLD:
+        return mul_karatsuba(a, b)
+
+    return mul_toom3(a, b)
+
+
+"""
+Parallel multiplication. With PARALLEL_WORKERS above 1, mul hands balanced products of at
+least PARALLEL_THRESHOLD limbs to mul_parallel: the operands are split and evaluated for
+Toom-3 here, the five third-size products are made in a pool of worker processes, and the
+interpolation sums them back together with one carry pass. The operands go to the workers
+and the products come back through shared memory, not pickles. Use set_parallel to change
+the settings; the pool is started the first time it's needed and kept for later products.
+"""
+PARALLEL_WORKERS = 1
+PARALLEL_THRESHOLD = 4000
+
+_pool = None
+_pool_workers = 0
+_in_worker = False
+
+
+def set_parallel(workers: int = None, threshold: int = None) -> None:
+    """
+    Set the number of worker processes for parallel multiplication (None for one per core,
+    1 to stay serial), and optionally the threshold in limbs.
+    """
+    global PARALLEL_WORKERS, PARALLEL_THRESHOLD
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("There has to be at least one worker")
+
+    PARALLEL_WORKERS = workers
+    if threshold is not None:
+        PARALLEL_THRESHOLD = threshold
+
+
+def _worker_init() -> None:
+    global _in_worker
+    _in_worker = True  # products in the workers stay serial
+
+
+def _get_pool(workers: int):
+    global _pool, _pool_workers
+
+    # imported here, so that serial use never pays for the multiprocessing machinery
+    from concurrent.futures import ProcessPoolExecutor
+
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown()
+        else:
+            atexit.register(_shutdown_pool)
+        _pool = ProcessPoolExecutor(workers, initializer=_worker_init)
+        _pool_workers = workers
+
+    return _pool
+
+
+def _shutdown_pool() -> None:
+    """
+    Shut the pool down at exit, before the modules it uses are torn down under it.
+    """
+    global _pool
+
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def _mul_shared(operands: str, products: str, x: tuple[int, int], y: tuple[int, int],
+                out: int) -> int:
+    """
+    Multiply the operands at the (limb offset, length) positions x and y of one shared block,
+    and write the product into another at limb offset out. Returns the product's length.
+    """
+    from multiprocessing import shared_memory
+
+    # workers share the parent's resource tracker, and the parent unlinks the blocks
+    in_block = shared_memory.SharedMemory(operands)
+    out_block = shared_memory.SharedMemory(products)
+    size = new().itemsize
+
+    try:
+        a = new()
+        a.frombytes(in_block.buf[x[0] * size:(x[0] + x[1]) * size])
+        b = new()
+        b.frombytes(in_block.buf[y[0] * size:(y[0] + y[1]) * size])
+
+        product = mul(a, b)
+        out_block.buf[out * size:(out + len(product)) * size] = product.tobytes()
+
+        return len(product)
+    finally:
+        in_block.close()
+        out_block.close()
+
+
+def _pool_products(pairs: list, workers: int) -> list[tuple[bool, array]]:
+    """
+    The signed products of the pairs, made in the pool.
+    """
+    from multiprocessing import shared_memory
+
+    size = new().itemsize
+    operands = [buffer for pair in pairs for _, buffer in pair]
+    in_limbs = sum(map(len, operands))
+    out_limbs = sum(len(x) + len(y) for (_, x), (_, y) in pairs)
+
+    in_block = shared_memory.SharedMemory(create=True, size=max(in_limbs, 1) * size)
+    out_block = shared_memory.SharedMemory(create=True, size=max(out_limbs, 1) * size)
+
+    try:
+        jobs = []
+        position = out = 0
+        for (_, x), (_, y) in pairs:
+            in_block.buf[position * size:(position + len(x)) * size] = x.tobytes()
+            in_block.buf[(position + len(x)) * size:(position + len(x) + len(y)) * size] = \
+                y.tobytes()
+            jobs.append(((position, len(x)), (position + len(x), len(y)), out))
+            position += len(x) + len(y)
+            out += len(x) + len(y)
+
+        pool = _get_pool(workers)
+        futures = [pool.submit(_mul_shared, in_block.name, out_block.name, x, y, offset)
+                   for x, y, offset in jobs]
+
+        results = []
+        for ((x_neg, _), (y_neg, _)), (_, _, offset), future in zip(pairs, jobs, futures):
+            product = new()
+            product.frombytes(out_block.buf[offset * size:(offset + future.result()) * size])
+            results.append((x_neg != y_neg, product))
+
+        return results
+    finally:
+        in_block.close()
+        in_block.unlink()
+        out_block.close()
+        out_block.unlink()
+
+
+def mul_parallel(a: array, b: array, workers: int = None) -> array:
+    """
+    Product of two buffers by Toom-3 with its five sub-products made in `workers` processes
+    (by default PARALLEL_WORKERS).
+    """
+    workers = workers or PARALLEL_WORKERS
+    if not a or not b:
+        return new()
+    if workers <= 1:
+        return mul_toom3(a, b)
+
+    return _toom3(a, b, lambda pairs: _pool_products(pairs, workers))
+
+
+def long_divmod(a: array, b: array) -> tuple[array, array]:
+    """
+    (a // b, a % b) by Knuth's algorithm D: one quotient limb per step, each estimated from the
+    top two limbs of the running remainder and corrected at most twice, so O(len(a) * len(b)).
+    """
+    if not b:
+        raise ZeroDivisionError("long division by zero")
+
+    if cmp(a, b) < 0:
+        return new(), new(a)
+
+    if len(b) == 1:
+        q, r = divmod_small(a, b[0])
+        return q, new([r] if r else [])
+
+    # Scale both so the top limb of the divisor is at least BASE / 2, which keeps the
+    # estimates close.
+    d = BASE // (b[-1] + 1)
+    u = mul_small(a, d).tolist()
+    v = mul_small(b, d).tolist()
+    if len(u) == len(a):
+        u.append(0)
+
+    n = len(v)
+    m = len(u) - n
+    v_top, v_next = v[-1], v[-2]
+    q = [0] * m
+
+    for j in range(m - 1, -1, -1):
+        q_hat, r_hat = divmod(u[j + n] * BASE + u[j + n - 1], v_top)
+        while q_hat >= BASE or q_hat * v_next > r_hat * BASE + u[j + n - 2]:
+            q_hat -= 1
+            r_hat += v_top
+            if r_hat >= BASE:
+                break
+
+        # multiply and subtract q_hat * v from the window of u
+        mul_carry = 0
+        borrow = 0
+        for i in range(n):
+            mul_carry, p = divmod(q_hat * v[i] + mul_carry, BASE)
+            t = u[i + j] - p - borrow
+            if t < 0:
+                u[i + j] = t + BASE
+                borrow = 1
+            else:
+                u[i + j] = t
+                borrow = 0
+
+        t = u[j + n] - mul_carry - borrow
+        if t < 0:
+            # q_hat was one too big: add v back
+            u[j + n] = t + BASE
+            q_hat -= 1
+            c = 0
+            for i in range(n):
+                s = u[i + j] + v[i] + c
+                if s >= BASE:
+                    u[i + j] = s - BASE
+                    c = 1
+                else:
+                    u[i + j] = s
+                    c = 0
+            u[j + n] = (u[j + n] + c) % BASE
+        else:
+            u[j + n] = t
+
+        q[j] = q_hat
+
+    r = divmod_small(normalize(new(u[:n])), d)[0]
+
+    return normalize(new(q)), r
+
+
+"""
+Below RECIPROCAL_BASE_DIGITS digits of precision a reciprocal is just long divided. Division
+switches from long division to Newton's reciprocal once both the divisor and the quotient are
+at least NEWTON_THRESHOLD limbs long.
+"""
+RECIPROCAL_BASE_DIGITS = 90
+NEWTON_THRESHOLD = 400
+
+
+def reciprocal(b: array, p: int) -> array:
+    """
+    Approximately 10^(nb + p) / b, where nb is the number of digits in b, to within a few units.
+
+    Newton's iteration y <- y + y(1 - by) doubles the number of correct digits each step, so
+    this recurses down to half the precision, then takes one step using only the leading
+    p + 2 digits of b. The total cost is a small multiple of one p-digit multiplication.
+    """
+    nb = num_digits(b)
+    if p <= RECIPROCAL_BASE_DIGITS:
+        return long_divmod(shift_up(new([1]), nb + p), b)[0]
+
+    h = p // 2 + 2
+    y = reciprocal(b, h)
+
+    # b cut (or padded) to p + 2 digits
+    width = p + 2
+    b_cut = shift_down(b, nb - width) if nb > width else shift_up(b, width - nb)
+
+    # the error 1 - by, scaled up by 10^(width + h)
+    e_neg, e = _signed_sub((False, shift_up(new([1]), width + h)), (False, mul(b_cut, y)))
+
+    step = shift_down(mul(y, e), width + 2 * h - p)
+    y = shift_up(y, p - h)
+
+    return sub(y, step) if e_neg else add(y, step)
+
+
+def newton_divmod(a: array, b: array) -> tuple[array, array]:
+    """
+    (a // b, a % b) by multiplying a by the reciprocal of b, then fixing up the last unit or
+    two of the quotient.
+    """
+    if cmp(a, b) < 0:
+        return new(), new(a)
+
+    one = new([1])
+    nb = num_digits(b)
+    p = num_digits(a) - nb + 2
+
+    q = shift_down(mul(a, reciprocal(b, p)), nb + p)
+    prod = mul(q, b)
+
+    while cmp(prod, a) > 0:
+        q = sub(q, one)
+        prod = sub(prod, b)
+
+    r = sub(a, prod)
+    while cmp(r, b) >= 0:
+        q = add(q, one)
+        r = sub(r, b)
+
+    return q, r
+
+
+def divide(a: array, b: array) -> tuple[array, array]:
+    """
+    (a // b, a % b), picking long division or Newton's reciprocal from the operand lengths.
+    """
+    if b and min(len(b), len(a) - len(b)) >= NEWTON_THRESHOLD:
+        return newton_divmod(a, b)
+
+    return long_divmod(a, b)
+
+
+def power(a: array, k: int) -> array:
+    """
+    a^k for k >= 0, by repeated squaring.
+    """
+    out = new([1])
+    while k:
+        if k & 1:
+            out = mul(out, a)
+        k >>= 1
+        if k:
+            a = mul(a, a)
+
+    return out
+
+
+"""
+Integer roots work like the reciprocal: the root of the leading digits of a gives the leading
+digits of the root, and one Newton step x <- ((k - 1)x + a // x^(k - 1)) // k from there
+doubles the number of correct digits. The Newton step never lands below the true root, so
+it's only ever fixed up downwards. Square roots skip the divisions: Newton's iteration for
+1/sqrt(a) needs only multiplications, and a times that is the root, so the cost is a small
+multiple of one multiplication of a's length. Roots of up to ROOT_BASE_DIGITS digits are
+just taken as ints.
+"""
+ROOT_BASE_DIGITS = 40
+
+
+def _int_root(n: int, k: int) -> int:
+    if n == 0 or k == 1:
+        return n
+
+    x = 1 << -(-n.bit_length() // k)  # above the root
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def _rsqrt(a: array, p: int) -> array:
+    """
+    Approximately 10^(p + m) / sqrt(a), where a has n digits and m = ceil(n / 2), to within a
+    few units.
+
+    Cutting an even number of digits off a leaves that unchanged, so each Newton step
+    y <- y + y(1 - ay^2) / 2 only needs the leading p + 4 or so digits of a, and it recurses
+    down to half the precision first, as reciprocal does.
+    """
+    n = num_digits(a)
+    if p <= ROOT_BASE_DIGITS:
+        cut = max((n - 2 * p - 4) // 2, 0) * 2
+        m = -(-(n - cut) // 2)
+        return from_int(_int_root(10 ** (2 * (p + m)) // to_int(shift_down(a, cut)), 2))
+
+    h = p // 2 + 2
+    y = _rsqrt(a, h)
+
+    cut = max((n - p - 4) // 2, 0) * 2
+    m = -(-(n - cut) // 2)
+
+    # the error 1 - ay^2, scaled up by 10^(2(h + m))
+    e_neg, e = _signed_sub((False, shift_up(new([1]), 2 * (h + m))),
+                           (False, mul(shift_down(a, cut), mul(y, y))))
+
+    step, _ = divmod_small(shift_down(mul(y, e), 3 * h + 2 * m - p), 2)
+    y = shift_up(y, p - h)
+
+    return sub(y, step) if e_neg else add(y, step)
+
+
+def _sqrt(a: array) -> tuple[array, array]:
+    """
+    (floor(sqrt(a)), its square), from a times its reciprocal square root.
+    """
+    m = -(-num_digits(a) // 2)
+    x = shift_down(mul(a, _rsqrt(a, m + 2)), 2 * m + 2)
+    x_2 = mul(x, x)
+
+    one = new([1])
+    while cmp(x_2, a) > 0:
+        x = sub(x, one)
+        x_2 = sub(x_2, add(mul_small(x, 2), one))
+
+    while True:
+        above = add(x_2, add(mul_small(x, 2), one))
+        if cmp(above, a) > 0:
+            return x, x_2
+        x, x_2 = add(x, one), above
+
+
+def _root(a: array, k: int) -> tuple[array, array]:
+    """
+    (floor(a^(1/k)), its k-th power).
+    """
+    n = num_digits(a)
+    root_digits = -(-n // k)
+    h = (root_digits - 2 - len(str(k))) // 2  # digits left to the Newton step
+    if root_digits <= ROOT_BASE_DIGITS or h < 1:
+        x = _int_root(to_int(a), k)
+        return from_int(x), from_int(x ** k)
+
+    if k == 2:
+        return _sqrt(a)
+
+    top, _ = _root(shift_down(a, k * h), k)
+    x = shift_up(top, h)
+
+    below = power(x, k - 1)
+    x, _ = divmod_small(add(mul_small(x, k - 1), divide(a, below)[0]), k)
+
+    x_k = power(x, k)
+    while cmp(x_k, a) > 0:
+        x = sub(x, new([1]))
+        x_k = power(x, k)
+
+    return x, x_k
+
+
+def root(a: array, k: int) -> tuple[array, bool]:
+    """
+    (floor(a^(1/k)), whether that's exactly the root), for k >= 1.
+    """
+    if k == 1 or not a:
+        return new(a), True
+
+    x, x_k = _root(a, k)
+
+    return x, cmp(x_k, a) == 0
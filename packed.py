@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Compact storage for large numbers of Glides.
+
+On its own a Glide carries over a hundred bytes of object overhead (the Glide itself and its
+limb array, plus any views of its digits it has cached) on top of the digits, which for
+values of a few dozen digits is most of its size. PackedGlides keeps any number of values in
+one contiguous limb buffer, with their offsets, exponents and flags in typed arrays alongside,
+so a value costs just its limbs (4 bytes per 9 digits, a little denser than packed BCD at 4
+bytes per 8) and 17 bytes of bookkeeping. Nothing is converted on the way in or out: a value
+goes in as a copy of its limbs and comes back out as one slice of the buffer, and get_limbs
+hands that slice straight to the limb kernels.
+"""
+from array import array
+from typing import Iterable, Iterator
+
+import limbs
+from Main import Glide
+
+_NEGATIVE = 1
+_HAS_PRECISION = 2
+
+
+class PackedGlides:
+    """
+    Many Glides held in one contiguous limb buffer.
+
+    ...
+
+    Attributes
+    ----------
+    values: iterable of Glides (or floats). The values to start with.
+
+    Methods
+    -------
+    append(value):
+        Add a Glide (or float) to the end.
+    extend(values):
+        Add each of values to the end.
+    get_limbs(i):
+        Value i as (limb buffer, exponent, negative), ready for the limb kernels.
+    to_glides():
+        The values as a list of Glides.
+    nbytes():
+        The number of bytes the values take up.
+    """
+
+    def __init__(self, values: Iterable = ()):
+        self._limbs = limbs.new()
+        self._offsets = array("Q", [0])  # value i's limbs are _limbs[_offsets[i]:_offsets[i + 1]]
+        self._exps = array("q")
+        self._flags = bytearray()
+        self._precisions = {}  # only for the values that have one
+
+        self.extend(values)
+
+    def __len__(self):
+        return len(self._exps)
+
+    def __getitem__(self, i: int) -> Glide:
+        buffer, exp, negative = self.get_limbs(i)
+        g = Glide._from_packed(buffer, exp, negative)
+
+        if self._flags[i % len(self)] & _HAS_PRECISION:
+            g.set_precision(self._precisions[i % len(self)])
+
+        return g
+
+    def __iter__(self) -> Iterator[Glide]:
+        return (self[i] for i in range(len(self)))
+
+    def __repr__(self):
+        return f"PackedGlides([{', '.join(str(g) for g in self)}])"
+
+    def append(self, value) -> None:
+        g = value if isinstance(value, Glide) else Glide(value)
+
+        if g.get_precision() is not None:
+            self._precisions[len(self)] = g.get_precision()
+
+        self._limbs.extend(g._limbs)
+        self._offsets.append(len(self._limbs))
+        self._exps.append(g._exp)
+        self._flags.append((g.get_sign() == "-ve" and bool(g._limbs))
+                           | (g.get_precision() is not None) << 1)
+
+    def extend(self, values: Iterable) -> None:
+        for value in values:
+            self.append(value)
+
+    def get_limbs(self, i: int) -> tuple[array, int, bool]:
+        if not -len(self) <= i < len(self):
+            raise IndexError("PackedGlides index out of range")
+
+        i %= len(self)
+
+        return (self._limbs[self._offsets[i]:self._offsets[i + 1]], self._exps[i],
+                bool(self._flags[i] & _NEGATIVE))
+
+    def to_glides(self) -> list[Glide]:
+        return list(self)
+
+    def nbytes(self) -> int:
+        return (len(self._limbs) * self._limbs.itemsize
+                + len(self._offsets) * self._offsets.itemsize
+                + len(self._exps) * self._exps.itemsize + len(self._flags))
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Primality testing without sympy.
+
+Below 2^64 Miller-Rabin with the first twelve primes as bases is deterministic (no strong
+pseudoprime to all of them is that small). Above that, the Baillie-PSW test is used: a strong
+base 2 Miller-Rabin test plus a strong Lucas test, which has no known counterexample.
+"""
+from math import isqrt
+
+SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+_DETERMINISTIC_LIMIT = 1 << 64
+
+
+def _strong_probable_prime(n: int, base: int) -> bool:
+    """
+    Miller-Rabin round: is odd n > 2 a strong probable prime to this base?
+    """
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    x = pow(base, d, n)
+    if x == 1 or x == n - 1:
+        return True
+
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+
+    return False
+
+
+def _jacobi(a: int, n: int) -> int:
+    """
+    The Jacobi symbol (a/n), for odd n > 0.
+    """
+    a %= n
+    result = 1
+
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+
+    return result if n == 1 else 0
+
+
+def _strong_lucas_probable_prime(n: int) -> bool:
+    """
+    Strong Lucas test with Selfridge's parameters: D the first of 5, -7, 9, -11, ... with
+    (D/n) = -1, P = 1 and Q = (1 - D) / 4. n must be odd and not a perfect square.
+    """
+    D = 5
+    while _jacobi(D, n) != -1:
+        if _jacobi(D, n) == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+
+    P = 1
+    Q = (1 - D) // 4
+
+    d = n + 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    def halve(x):
+        x %= n
+        return (x if x % 2 == 0 else x + n) // 2
+
+    # Walk the bits of d: double the index each step, and step it on by one for a set bit.
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = halve(P * U + V), halve(D * U + P * V)
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if V == 0:
+            return True
+
+    return False
+
+
+def isprime(n: int) -> bool:
+    """
+    Whether n is prime: exact below 2^64, Baillie-PSW above.
+    """
+    if n < 2:
+        return False
+
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+
+    if n < SMALL_PRIMES[-1] ** 2:
+        return True
+
+    if n < _DETERMINISTIC_LIMIT:
+        return all(_strong_probable_prime(n, base) for base in SMALL_PRIMES)
+
+    if not _strong_probable_prime(n, 2):
+        return False
+
+    if isqrt(n) ** 2 == n:
+        return False
+
+    return _strong_lucas_probable_prime(n)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Scanning digit streams for primes in every window of k consecutive digits.
+
+Each window is kept as an int and rolled forward one digit at a time, w = (w * 10 + d) mod 10^k,
+instead of re-slicing and re-parsing the text. Windows sharing a factor with a small primorial
+are thrown out on the spot, and the survivors go off in batches to a process pool for the
+real primality test. Results always come back in offset order.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from math import gcd, prod
+from typing import Iterable, Iterator, Optional, Union
+
+from primality import isprime
+
+SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79,
+                83, 89, 97)
+_PRIMORIAL = prod(SMALL_PRIMES)
+
+
+def rolling_windows(chunks: Iterable, width: int) -> Iterator[tuple[int, int]]:
+    """
+    Yield (offset, value) for every window of `width` digits in a stream of str/bytes chunks.
+    A window's value ignores its leading zeros, just like int() of its text.
+    """
+    mod = 10 ** width
+    w = 0
+    seen = 0
+
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("ascii")
+
+        for d in chunk:
+            w = (w * 10 + d - 48) % mod
+            seen += 1
+            if seen >= width:
+                yield seen - width, w
+
+
+def might_be_prime(n: int) -> bool:
+    """
+    Cheap pre-filter: False if n is certainly composite (or < 2) by the small primes.
+    """
+    if n < 2:
+        return False
+
+    return gcd(n, _PRIMORIAL) == 1 or n in SMALL_PRIMES
+
+
+def _test_batch(batch: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    return [(offset, n) for offset, n in batch if isprime(n)]
+
+
+def _batches(windows: Iterator[tuple[int, int]], batch_size: int,
+             limit: Optional[int]) -> Iterator[list[tuple[int, int]]]:
+    batch = []
+
+    for offset, n in windows:
+        if limit is not None and offset >= limit:
+            break
+        if might_be_prime(n):
+            batch.append((offset, n))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+
+    if batch:
+        yield batch
+
+
+def scan_primes(source: Union[str, bytes, Iterable], width: int = 10, first: bool = True,
+                workers: Optional[int] = None, batch_size: int = 4096,
+                limit: Optional[int] = None) -> list[tuple[int, int]]:
+    """
+    Find the windows of `width` digits in `source` whose values are prime.
+
+    Parameters
+    ----------
+    source : the digits, as a str or bytes, a digitfile.DigitFile, or an iterable of chunks.
+    width : how many digits are in a window.
+    first : stop at the first prime window, rather than finding all of them.
+    workers : size of the process pool (default: one per core). With 1, everything is done
+              in this process.
+    batch_size : how many pre-filtered windows go to a worker at a time.
+    limit : only windows starting before this offset are checked.
+
+    Returns
+    -------
+    A list of (offset, value) for the prime windows, in offset order (at most one if `first`).
+    """
+    if isinstance(source, (str, bytes)):
+        chunks = [source]
+    elif hasattr(source, "chunks"):
+        chunks = source.chunks()
+    else:
+        chunks = source
+
+    batches = _batches(rolling_windows(chunks, width), batch_size, limit)
+    hits = []
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        for batch in batches:
+            hits += _test_batch(batch)
+            if first and hits:
+                return hits[:1]
+
+        return hits
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+
+        # Keep a few batches per worker in flight, and collect them in submission order so
+        # hits stay in offset order and the first one found really is the first.
+        for batch in batches:
+            pending.append(pool.submit(_test_batch, batch))
+            if len(pending) >= 4 * workers:
+                hits += pending.popleft().result()
+                if first and hits:
+                    break
+
+        while pending and not (first and hits):
+            hits += pending.popleft().result()
+
+        for future in pending:
+            future.cancel()
+
+    return hits[:1] if first else hits
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Evaluation of rational series by binary splitting.
+
+A series of the form
+
+    S = sum_{n=0}^{N-1} a(n) * (p(0) p(1) ... p(n)) / (q(0) q(1) ... q(n))
+
+with integer valued a, p and q is summed exactly: the range of terms is split in half
+recursively, and each half is described by three integers P, Q and T with S = T / Q. Only
+the final T / Q is a (precision limited) Glide division, so e = sum 1/n! and the other
+hypergeometric series cost a handful of big multiplications instead of one long division
+per term.
+"""
+import hashlib
+import os
+import struct
+from math import lgamma, log
+from typing import Callable, NamedTuple, Optional, Union
+
+from context import localcontext
+from Main import Glide, dump_glide, glide_from_int, load_glide
+
+"""
+Ranges of at most LEAF_TERMS terms are combined with plain Python ints, which are still small
+there, before being turned into Glides.
+"""
+LEAF_TERMS = 16
+
+
+def _split_ints(a: Callable[[int], int], p: Callable[[int], int], q: Callable[[int], int],
+                n1: int, n2: int) -> tuple[int, int, int]:
+    big_p = p(n1)
+    big_q = q(n1)
+    big_t = a(n1) * big_p
+
+    for n in range(n1 + 1, n2):
+        pn = p(n)
+        big_t = big_t * q(n) + a(n) * big_p * pn
+        big_p *= pn
+        big_q *= q(n)
+
+    return big_p, big_q, big_t
+
+
+def binary_split(a: Callable[[int], int], p: Callable[[int], int], q: Callable[[int], int],
+                 n1: int, n2: int) -> tuple[Glide, Glide, Glide]:
+    """
+    Get P, Q and T for the terms n1 <= n < n2 of the series.
+
+    Parameters
+    ----------
+    a, p, q : functions giving the integers a(n), p(n), q(n) of the series.
+    n1, n2 : the range of terms.
+
+    Returns
+    -------
+    (P, Q, T): integer Glides with P = p(n1)...p(n2-1), Q = q(n1)...q(n2-1) and T / Q the sum of
+               the terms, each taken relative to p(0)...p(n1-1) / q(0)...q(n1-1).
+    """
+    if n2 - n1 <= LEAF_TERMS:
+        return tuple(glide_from_int(x) for x in _split_ints(a, p, q, n1, n2))
+
+    m = (n1 + n2) // 2
+    p1, q1, t1 = binary_split(a, p, q, n1, m)
+    p2, q2, t2 = binary_split(a, p, q, m, n2)
+
+    return p1 * p2, q1 * q2, t1 * q2 + p1 * t2
+
+
+"""
+Long sums can be checkpointed. Given a checkpoint, sum_series works through the terms a block
+of checkpoint_terms at a time, folding each block's P, Q and T into running totals, and hands
+the totals to checkpoint.save after every block. It starts from whatever checkpoint.load
+returns, so a run that was interrupted picks up from its last checkpoint instead of term 0,
+as long as that was a checkpoint of the same sum: the same series (told apart by a hash of
+its first and last few terms) to the same number of terms. Anything else is started over.
+Once the sum is done, checkpoint.clear is called, as the checkpoint has no more use. A
+checkpoint can be anything with those three methods; FileCheckpoint keeps them in a file.
+"""
+CHECKPOINT_TERMS = 1 << 12
+SERIES_SAMPLE_TERMS = 8
+
+
+class SeriesState(NamedTuple):
+    """
+    How far a sum has got: the first `index` of its `terms` terms are in P, Q and T. `series`
+    identifies the series, as given by series_id.
+    """
+    index: int
+    terms: int
+    series: bytes
+    p: Glide
+    q: Glide
+    t: Glide
+
+
+def series_id(a: Callable[[int], int], p: Callable[[int], int], q: Callable[[int], int],
+              terms: int) -> bytes:
+    """
+    16 bytes to tell one series from another: a hash of a, p and q at its first and last
+    SERIES_SAMPLE_TERMS terms.
+    """
+    sample = sorted({*range(min(terms, SERIES_SAMPLE_TERMS)),
+                     *range(max(terms - SERIES_SAMPLE_TERMS, 0), terms)})
+
+    return hashlib.blake2b(repr([(a(n), p(n), q(n)) for n in sample]).encode(),
+                           digest_size=16).digest()
+
+
+class FileCheckpoint:
+    """
+    Checkpoints of a sum kept in a file: a header of CHECKPOINT_MAGIC, the index and number
+    of terms as 8 byte little-endian ints and the 16 byte series id, then P, Q and T in the
+    binary Glide format.
+
+    Each save writes a new file and renames it over the old one, so a crash part way through
+    leaves the previous checkpoint as it was.
+
+    ...
+
+    Attributes
+    ----------
+    path: where the checkpoint is kept.
+
+    Methods
+    -------
+    load():
+        The saved state, or None if nothing has been saved yet.
+    save(state):
+        Replace the saved state.
+    clear():
+        Delete the saved state.
+    """
+    CHECKPOINT_MAGIC = b"GLIDECK2"
+    _HEADER = struct.Struct("<8sQQ16s")
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+
+    def load(self) -> Optional[SeriesState]:
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return None
+
+        with f:
+            header = f.read(self._HEADER.size)
+            if len(header) < self._HEADER.size or header[:8] != self.CHECKPOINT_MAGIC:
+                raise ValueError(f"{self.path} isn't a series checkpoint")
+
+            _, index, terms, series = self._HEADER.unpack(header)
+
+            return SeriesState(index, terms, series, load_glide(f), load_glide(f), load_glide(f))
+
+    def save(self, state: SeriesState) -> None:
+        temp = self.path + ".tmp"
+
+        with open(temp, "wb") as f:
+            f.write(self._HEADER.pack(self.CHECKPOINT_MAGIC, state.index, state.terms,
+                                      state.series))
+            for g in (state.p, state.q, state.t):
+                dump_glide(g, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temp, self.path)
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _checkpointed_split(a: Callable[[int], int], p: Callable[[int], int],
+                        q: Callable[[int], int], terms: int, checkpoint,
+                        block: int) -> tuple[Glide, Glide, Glide]:
+    """
+    P, Q and T for the first `terms` terms, a block at a time from the last checkpoint (if it
+    was of this sum).
+    """
+    series = series_id(a, p, q, terms)
+
+    state = checkpoint.load()
+    if state is None or state.terms != terms or state.series != series:
+        state = SeriesState(0, terms, series, glide_from_int(1), glide_from_int(1),
+                            glide_from_int(0))
+
+    index, big_p, big_q, big_t = state.index, state.p, state.q, state.t
+
+    while index < terms:
+        stop = min(index + block, terms)
+        p2, q2, t2 = binary_split(a, p, q, index, stop)
+        big_p, big_q, big_t = big_p * p2, big_q * q2, big_t * q2 + big_p * t2
+        index = stop
+        checkpoint.save(SeriesState(index, terms, series, big_p, big_q, big_t))
+
+    checkpoint.clear()
+
+    return big_p, big_q, big_t
+
+
+def sum_series(a: Callable[[int], int], p: Callable[[int], int], q: Callable[[int], int],
+               terms: int, precision: int, checkpoint=None,
+               checkpoint_terms: int = CHECKPOINT_TERMS) -> Glide:
+    """
+    Sum the first `terms` terms of the series, with one division at the given precision.
+    With a checkpoint (e.g. a FileCheckpoint), the running totals are saved every
+    checkpoint_terms terms, the sum resumes from the last ones saved, and the checkpoint is
+    cleared once the sum is done.
+    """
+    with localcontext(prec=None):  # P, Q and T have to be exact
+        if checkpoint is None:
+            _, big_q, big_t = binary_split(a, p, q, 0, terms)
+        else:
+            _, big_q, big_t = _checkpointed_split(a, p, q, terms, checkpoint, checkpoint_terms)
+
+    return big_t.set_precision(precision) / big_q
+
+
+def e_terms(precision: int) -> int:
+    """
+    The number of terms of sum 1/n! needed for `precision` digits: enough that n! > 10^(precision + 2).
+    """
+    n = 1
+    while lgamma(n + 1) / log(10) < precision + 2:
+        n += 1
+
+    return n
+
+
+def compute_e(precision: int, checkpoint=None) -> Glide:
+    """
+    e = sum 1/n!, to `precision` digits, checkpointed as in sum_series.
+    """
+    return sum_series(lambda n: 1, lambda n: 1, lambda n: n or 1, e_terms(precision), precision,
+                      checkpoint)
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Streams of the decimal digits of constants, so consumers can start before the whole constant
+has been computed.
+
+The digits come out as they become certain: the constant is computed at some precision, the
+digits that rounding error can't reach are handed out, and once the consumer has got through
+them the precision is doubled and the constant computed again. So stopping early (at the
+first prime window, say) only costs about as much as the digits that were actually used,
+and running to N digits costs about twice one computation at N, where a digit at a time
+spigot would be quadratic. Only the latest computation is held on to.
+
+The chunks are str of digits, with the integer part first (as in accurate_e.txt), so they can
+go straight to scanner.scan_primes or digitfile.write_digits:
+
+    scan_primes(e_chunks(), width=10)
+    write_digits("pi.txt", pi_chunks(limit=10 ** 6))
+"""
+from typing import Callable, Iterable, Iterator, Optional
+
+import elementary
+from Main import Glide, glide_to_string
+
+INITIAL_DIGITS = 1000
+
+
+def _known(text: str) -> int:
+    """
+    How many leading digits of a constant rounded to len(text) significant digits are
+    certain. The last place may be out by a unit and a half, which can carry through a run of
+    9s (or borrow through a run of 0s), so the digits before such a run at the end aren't.
+    """
+    k = len(text) - 2
+    while k > 0:
+        n = int(text[k:])
+        if 2 <= n <= 10 ** (len(text) - k) - 3:
+            return k
+        k -= 1
+
+    return 0
+
+
+def stream(compute: Callable[[int], Glide], limit: Optional[int] = None,
+           chunk_size: Optional[int] = None,
+           precision: int = INITIAL_DIGITS) -> Iterator[str]:
+    """
+    Stream the digits of a constant.
+
+    Parameters
+    ----------
+    compute : gives the constant correctly rounded (to within a unit) to a number of
+              significant digits, e.g. elementary.pi.
+    limit : stop after this many digits, or None to go on for ever.
+    chunk_size : the length of the chunks, or None for whatever became known at each step.
+    precision : the number of digits to compute first.
+
+    Yields chunks of digits as strings.
+    """
+    chunks = _stream(compute, limit, precision)
+
+    return chunks if chunk_size is None else rechunk(chunks, chunk_size)
+
+
+def _stream(compute: Callable[[int], Glide], limit: Optional[int],
+            precision: int) -> Iterator[str]:
+    done = 0
+
+    while limit is None or done < limit:
+        text = glide_to_string(compute(precision)).ljust(precision, "0")
+        known = _known(text)
+        if limit is not None:
+            known = min(known, limit)
+
+        if known > done:
+            yield text[done:known]
+            done = known
+
+        precision *= 2
+
+
+def rechunk(chunks: Iterable[str], size: int) -> Iterator[str]:
+    """
+    Regroup a stream of digit chunks into chunks of exactly `size` digits (bar the last).
+    Each chunk is sliced where it lies, and only the short leftover at its end is carried on
+    to the next, so long chunks aren't copied over and over.
+    """
+    pending = ""
+
+    for chunk in chunks:
+        start = 0
+        if pending:
+            start = size - len(pending)
+            if start > len(chunk):
+                pending += chunk
+                continue
+            yield pending + chunk[:start]
+
+        stop = start + (len(chunk) - start) // size * size
+        for i in range(start, stop, size):
+            yield chunk[i:i + size]
+
+        pending = chunk[stop:]
+
+    if pending:
+        yield pending
+
+
+def digits(chunks: Iterable[str]) -> Iterator[int]:
+    """
+    A stream of digit chunks one digit at a time, as ints.
+    """
+    for chunk in chunks:
+        yield from map(int, chunk)
+
+
+def e_chunks(limit: Optional[int] = None, chunk_size: Optional[int] = None) -> Iterator[str]:
+    return stream(elementary.e, limit, chunk_size)
+
+
+def pi_chunks(limit: Optional[int] = None, chunk_size: Optional[int] = None) -> Iterator[str]:
+    return stream(elementary.pi, limit, chunk_size)
+
+
+def e_digits(limit: Optional[int] = None) -> Iterator[int]:
+    return digits(e_chunks(limit))
+
+
+def pi_digits(limit: Optional[int] = None) -> Iterator[int]:
+    return digits(pi_chunks(limit))
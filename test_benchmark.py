@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+A quick run of the benchmark suite at small sizes, and its baseline comparison.
+
+    python -m pytest -q test_benchmark.py
+"""
+import sys
+
+from benchmark import OPERATIONS, diff, run
+
+
+def test_run_and_diff():
+    limit = sys.get_int_max_str_digits()
+    current = run([10, 50], OPERATIONS, min_time=0.001, repeat=1)
+
+    assert sys.get_int_max_str_digits() == limit
+    assert set(current["results"]) == set(OPERATIONS)
+    assert all(set(by_size) == {"10", "50"} and all(t > 0 for t in timings.values())
+               for by_size in current["results"].values() for timings in by_size.values())
+
+    new = current["results"]["mul"]["10"]["glide"]
+    baseline = {"results": {"mul": {"10": {"glide": new / 2}}, "add": {"1000": {"glide": 1.0}}}}
+    assert diff(current, baseline) == \
+        [{"op": "mul", "size": 10, "old": new / 2, "new": new, "ratio": 2.0, "regression": True}]
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Checks of rounding to a context against the decimal module, whose rounding modes these are.
+
+    python -m pytest -q test_context.py
+"""
+import decimal
+
+import pytest
+
+from conftest import random_glide_text
+from context import ROUNDING_MODES, localcontext
+from Main import ZERO, glide_from_string
+
+
+def _check(a: str, b: str, prec: int, rounding: str, ops=("add", "multiply", "divide")):
+    dctx = decimal.Context(prec=prec, rounding=rounding, Emax=10 ** 6, Emin=-10 ** 6)
+
+    with localcontext(prec=prec, rounding=rounding):
+        ga, gb = glide_from_string(a), glide_from_string(b)
+        results = {"add": lambda: ga + gb, "multiply": lambda: ga * gb, "divide": lambda: ga / gb}
+
+        for op in ops:
+            if op == "divide" and gb == ZERO:
+                continue
+            expected = getattr(dctx, op)(decimal.Decimal(a), decimal.Decimal(b))
+            assert decimal.Decimal(str(results[op]())) == expected, (a, b, prec, rounding, op)
+
+
+@pytest.mark.parametrize("rounding", ROUNDING_MODES)
+def test_context_rounding(r, rounding):
+    for _ in range(100):
+        _check(random_glide_text(r), random_glide_text(r), r.randrange(1, 25), rounding)
+
+
+@pytest.mark.parametrize("rounding", ROUNDING_MODES)
+def test_cut_products_near_a_boundary(r, rounding):
+    # Operands long enough to be cut, whose products land just either side of a rounding
+    # boundary: within what the cut off digits could add, or exactly on it.
+    _check("1." + "0" * 44 + "1", "1.24" + "9" * 50, 2, rounding, ["multiply"])
+
+    for _ in range(200):
+        prec = r.randrange(1, 12)
+        tail = r.randrange(25, 80)
+        head = f"{r.randrange(1, 10)}.{r.randrange(10 ** prec):0{prec}d}"
+        b = head + r.choice("4590") + r.choice("09") * tail + r.choice(["", "1", "7"])
+        a = "1." + "0" * r.randrange(tail - 10, tail + 10) + r.choice("0123")
+        a, b = (a, b) if r.random() < 0.5 else (b, a)
+        _check(r.choice(["", "-"]) + a, b, prec, rounding, ["multiply"])
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Round trips through the digit files, plain and packed.
+
+    python -m pytest -q test_digitfile.py
+"""
+import pytest
+
+from conftest import random_glide_text
+from digitfile import DigitFile, pack_bcd, unpack_bcd, write_digits
+from Main import glide_from_int, glide_from_string, glide_to_string
+
+
+def test_bcd(r):
+    for n in (0, 1, 2, 7, 1000):
+        digits = bytes(r.choice(b"0123456789") for _ in range(n))
+        packed = pack_bcd(digits)
+        assert len(packed) == (n + 1) // 2
+        assert unpack_bcd(packed, n) == digits
+        assert unpack_bcd(packed) == digits + b"0" * (n % 2)
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_write_glide(r, tmp_path, packed):
+    values = [glide_from_string(random_glide_text(r).lstrip("-")) for _ in range(20)]
+    values += [glide_from_int(0), glide_from_int(7).left_shift(25),
+               glide_from_string("0.000123"), glide_from_int(10 ** 200 - 1)]
+
+    for g in values:
+        path = tmp_path / "digits"
+        text = glide_to_string(g)
+        assert write_digits(path, g, packed=packed, chunk_limbs=2) == len(text)
+
+        with DigitFile(path) as f:
+            assert f.is_packed() == packed and len(f) == len(text)
+            assert bytes(f.window(0, len(text))).decode() == text
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_read(r, tmp_path, packed):
+    text = "".join(r.choice("0123456789") for _ in range(1001))
+    path = tmp_path / "digits"
+    write_digits(path, (text[i:i + 37] for i in range(0, len(text), 37)), packed=packed)
+
+    with DigitFile(path) as f:
+        for start, width in ((0, 1), (1, 1), (3, 10), (998, 10), (1001, 5), (-2, 4)):
+            window = f.window(start, width)
+            assert bytes(window).decode() == text[max(start, 0):max(start, 0) + width]
+            if isinstance(window, memoryview):
+                window.release()
+
+        for size, start in ((1, 0), (10, 0), (9, 5), (4096, 0)):
+            blocks = [bytes(block).decode() for block in f.chunks(size, start)]
+            assert "".join(blocks) == text[start:]
+
+        for units in (1, 0, 1001, 400):
+            g = f.to_glide(units, block_limbs=3)
+            whole, places = text[:units], text[units:]
+            assert g == glide_from_string(f"{whole or 0}.{places}" if places else whole)
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Checks of the elementary functions against decimal's exp and ln, and against Taylor series
+summed in decimal far beyond the precision being checked.
+
+    python -m pytest -q test_elementary.py
+"""
+import decimal
+
+import pytest
+
+import elementary
+from context import localcontext
+from Main import glide_from_string
+
+D = decimal.Decimal
+
+
+def _random_text(r, whole_digits: int = 2) -> str:
+    places = r.randrange(0, 15)
+    whole = r.randrange(10 ** whole_digits)
+
+    return f"{r.choice(['', '-'])}{whole}.{r.randrange(10 ** places):0{places}d}"
+
+
+def _taylor(x: D, odd: bool, alternate: bool = True) -> D:
+    """
+    sum x^n / n! (over odd or even n, with alternating signs) at the current decimal precision.
+    """
+    total, term, n = D(0), D(1), 0
+    if odd:
+        term, n = x, 1
+
+    while True:
+        total += term
+        n += 2
+        term *= (-x * x if alternate else x * x) / ((n - 1) * n)
+        if abs(term) < D(10) ** (-decimal.getcontext().prec - 5):
+            return total
+
+
+def _atan_series(x: D) -> D:
+    total, power, n = D(0), x, 1
+    while abs(power) > D(10) ** (-decimal.getcontext().prec - 5):
+        total += power / n
+        power *= -x * x
+        n += 2
+
+    return total
+
+
+def _pi(prec: int) -> D:
+    with decimal.localcontext(decimal.Context(prec=prec + 10)):
+        return +(16 * _atan_series(D(1) / 5) - 4 * _atan_series(D(1) / 239))
+
+
+def _sin_cos(x: D, prec: int) -> tuple[D, D]:
+    """
+    sin x and cos x to prec significant digits and more, after taking out the multiples of 2 pi
+    with pi to enough digits that nothing that cancels matters.
+    """
+    work = prec + 60 + max(x.adjusted(), 0)
+    with decimal.localcontext(decimal.Context(prec=work)):
+        two_pi = 2 * _pi(work)
+        r = x - two_pi * (x / two_pi).to_integral_value(decimal.ROUND_HALF_EVEN)
+        return _taylor(r, True), _taylor(r, False)
+
+
+def _atan(x: D, prec: int) -> D:
+    with decimal.localcontext(decimal.Context(prec=prec + 30)):
+        if x < 0:
+            return -_atan(-x, prec)
+        if x > 1:
+            return _pi(prec + 30) / 2 - _atan(1 / x, prec)
+
+        halvings = 0
+        while x > D("0.1"):  # atan x = 2 atan(x / (1 + sqrt(1 + x^2)))
+            x = x / (1 + (1 + x * x).sqrt())
+            halvings += 1
+
+        return _atan_series(x) * 2 ** halvings
+
+
+def _check(f, text: str, prec: int, expected: D):
+    with localcontext(prec=prec):
+        got = D(str(f(glide_from_string(text))))
+
+    assert got == decimal.Context(prec=prec).plus(expected), (f.__name__, text, prec)
+
+
+def test_exp_log(r):
+    for _ in range(60):
+        prec, text = r.randrange(5, 40), _random_text(r)
+        _check(elementary.exp, text, prec, decimal.Context(prec=prec).exp(D(text)))
+
+        positive = text.lstrip("-")
+        if D(positive):
+            _check(elementary.log, positive, prec, decimal.Context(prec=prec).ln(D(positive)))
+
+    for text in ("1.0000000000001", "0.99999999", "0." + "0" * 29 + "1"):
+        _check(elementary.log, text, 30, decimal.Context(prec=30).ln(D(text)))
+
+
+def test_sin_cos(r):
+    texts = [_random_text(r, r.choice([1, 2, 6])) for _ in range(40)]
+
+    # big arguments, and ones just off multiples of pi/2, where most of the digits cancel
+    with decimal.localcontext(decimal.Context(prec=80)):
+        half_pi = _pi(80) / 2
+    for k in (1, 2, 3, 7, 1000001, 10 ** 12):
+        with decimal.localcontext(decimal.Context(prec=80)):
+            texts.append(str((k * half_pi).quantize(D(10) ** -35)))
+    texts += ["1" + "0" * 25, "-123456789.5"]
+
+    for text in texts:
+        prec = r.randrange(5, 30)
+        s, c = _sin_cos(D(text), prec)
+        _check(elementary.sin, text, prec, s)
+        _check(elementary.cos, text, prec, c)
+
+
+def test_atan(r):
+    texts = [_random_text(r, r.choice([0, 1, 4])) for _ in range(40)]
+    texts += ["1", "-1", "1.0000000001", "0.9999999999", "123456789012.5", "0.0000001"]
+
+    for text in texts:
+        prec = r.randrange(5, 30)
+        _check(elementary.atan, text, prec, _atan(D(text), prec))
+
+
+@pytest.mark.parametrize("precision", [1, 10, 50, 300])
+def test_constants(monkeypatch, precision):
+    monkeypatch.setattr(elementary, "_cache", {})
+    ctx = decimal.Context(prec=precision)
+
+    assert D(str(elementary.pi(precision))) == ctx.plus(_pi(precision + 10))
+    assert D(str(elementary.ln2(precision))) == decimal.Context(prec=precision).ln(2)
+    assert D(str(elementary.e(precision))) == decimal.Context(prec=precision).exp(1)
+
+
+def test_cache_hit_at_lower_precision(monkeypatch):
+    monkeypatch.setattr(elementary, "_cache", {})
+    high = elementary.pi(100)
+
+    def recompute(precision):
+        raise AssertionError(f"pi was worked out again, to {precision} digits")
+
+    monkeypatch.setattr(elementary, "_compute_pi", recompute)
+    for precision in (100, 60, 5):
+        expected = decimal.Context(prec=precision).plus(D(str(high)))
+        assert D(str(elementary.pi(precision))) == expected
+
+    # sin reduces by pi/2 from the same cache
+    with localcontext(prec=20):
+        assert D(str(elementary.sin(glide_from_string("3")))) == \
+            decimal.Context(prec=20).plus(_sin_cos(D(3), 20)[0])
+
+    with pytest.raises(AssertionError):
+        elementary.pi(101)
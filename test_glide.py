@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+Checks of Glide arithmetic against Python's own Fraction and decimal.
+
+    python -m pytest -q test_glide.py
+"""
+import copy
+import decimal
+import io
+import operator
+import pickle
+from fractions import Fraction
+
+import pytest
+
+from conftest import fraction, random_glide_text
+from context import ROUND_DOWN, ROUNDING_MODES, localcontext
+from Main import (ONE, TEN, ZERO, Glide, dump_glide, glide_from_bytes, glide_from_int,
+                  glide_from_string, glide_to_bytes, glide_to_int, load_glide)
+
+
+def test_exact_arithmetic(r):
+    for _ in range(300):
+        a, b = glide_from_string(random_glide_text(r)), glide_from_string(random_glide_text(r))
+        fa, fb = fraction(a), fraction(b)
+
+        assert fraction(a + b) == fa + fb
+        assert fraction(a - b) == fa - fb
+        assert fraction(a * b) == fa * fb
+
+
+def test_digits(r):
+    for _ in range(300):
+        text = random_glide_text(r)
+        g = glide_from_string(text)
+        whole, _, places = text.lstrip("-").partition(".")
+
+        assert fraction(g) == Fraction(decimal.Decimal(text))
+        assert g.get_units() == [int(d) for d in str(int(whole))]
+        assert g.get_decs() == ([int(d) for d in places] or [0])
+        assert all(limb < 10 ** 9 for limb in g._limbs) and (not g._limbs or g._limbs[-1])
+
+
+def test_divmod(r):
+    for _ in range(300):
+        a, b = glide_from_string(random_glide_text(r)), glide_from_string(random_glide_text(r))
+        fa, fb = fraction(a), fraction(b)
+
+        if fb:
+            q, m = divmod(a, b)
+            assert fraction(q) == fa // fb and fraction(m) == fa - fb * (fa // fb)
+
+
+def test_truediv(r):
+    for _ in range(100):
+        a, b = glide_from_string(random_glide_text(r)), glide_from_string(random_glide_text(r))
+        if b != ZERO:
+            exact = fraction(a) / fraction(b)
+            assert abs(fraction(a.set_precision(80) / b) - exact) <= max(abs(exact), 1) / 10 ** 75
+
+    assert str(glide_from_int(22) / glide_from_int(22)) == "1.0"
+    for zero in (ZERO, glide_from_string("-0.000")):
+        for a in (glide_from_int(3), ZERO):
+            with pytest.raises(ZeroDivisionError):
+                a / zero
+
+
+def test_comparisons(r):
+    for _ in range(300):
+        a, b = glide_from_string(random_glide_text(r)), glide_from_string(random_glide_text(r))
+        fa, fb = fraction(a), fraction(b)
+
+        assert (a < b, a <= b, a == b, a != b, a >= b, a > b) == \
+            (fa < fb, fa <= fb, fa == fb, fa != fb, fa >= fb, fa > fb)
+
+    # trailing zeros and the sign of zero don't count
+    assert glide_from_string("1.500") == glide_from_string("1.5")
+    assert glide_from_string("-0.00") == ZERO and not glide_from_string("-0.0") < ZERO
+    assert glide_from_string("0.999999999999") < glide_from_int(1) < \
+        glide_from_string("1.0000000001")
+
+
+def test_in_place_operators(r):
+    for _ in range(100):
+        a, b = glide_from_string(random_glide_text(r)), glide_from_string(random_glide_text(r))
+        fa, fb = fraction(a), fraction(b)
+
+        alias = a
+        a += b
+        assert fraction(a) == fa + fb and fraction(alias) == fa
+        a -= b
+        assert fraction(a) == fa
+
+        small = glide_from_int(r.randrange(-10 ** 9 + 1, 10 ** 9))
+        alias = a
+        a *= small
+        assert fraction(a) == fa * fraction(small) and fraction(alias) == fa
+
+    # zero has no sign
+    w = glide_from_int(-5)
+    w += glide_from_int(5)
+    assert w.get_sign() == "+ve"
+    w = glide_from_int(-5)
+    w *= ZERO
+    assert w.get_sign() == "+ve"
+
+
+def test_int_conversion(r):
+    for bits in (0, 1, 64, 5000, 40000):
+        x = r.getrandbits(bits) * r.choice([1, -1])
+        g = glide_from_int(x)
+        assert glide_to_int(g) == x and fraction(g) == x
+
+
+def test_value_semantics(r):
+    for _ in range(50):
+        a, b = glide_from_string(random_glide_text(r)), glide_from_string(random_glide_text(r))
+        fa, fb = fraction(a), fraction(b)
+
+        for op in (operator.iadd, operator.isub, operator.imul,
+                   type(a).__iadd__, type(a).__isub__, type(a).__imul__):
+            op(a, b)
+            op(a, glide_from_int(3))
+            assert fraction(a) == fa, op
+
+    # the constants, and a buffer shared with another Glide, stay as they were
+    x = glide_from_int(-7)
+    y = abs(x)
+    y += ONE
+    assert x == glide_from_int(-7) and y == glide_from_int(8)
+    z = ZERO
+    z += ONE
+    assert ZERO == glide_from_int(0) and z == ONE
+    with pytest.raises(AttributeError):
+        ONE.set_sign("-ve")
+
+
+def test_accumulate(r):
+    for _ in range(50):
+        total = copy.copy(glide_from_string(random_glide_text(r)))
+        expected = fraction(total)
+
+        for _ in range(20):
+            term = glide_from_string(random_glide_text(r))
+            subtract = r.random() < 0.5
+            assert total.accumulate(term, subtract) is total
+            expected += -fraction(term) if subtract else fraction(term)
+            assert fraction(total) == expected
+
+        # a term with no more decimal places than the total is added into the same buffer
+        buffer = total._limbs
+        total.accumulate(glide_from_int(10 ** 20 + 1))
+        assert total._limbs is buffer
+
+    # Glides sharing the buffer, and the constants, are left alone
+    x = copy.copy(glide_from_int(-7))
+    y, z = abs(x), -x
+    x.accumulate(glide_from_int(2))
+    x.accumulate(glide_from_int(2))
+    assert (x, y, z) == (glide_from_int(-3), glide_from_int(7), glide_from_int(7))
+    with pytest.raises(AttributeError):
+        ONE.accumulate(ONE)
+    assert ONE == glide_from_int(1)
+
+    w = copy.copy(glide_from_int(-5))
+    w.accumulate(glide_from_int(-5), subtract=True)
+    assert w.get_sign() == "+ve" and w == ZERO
+
+
+def test_hash():
+    assert hash(glide_from_string("1.50")) == hash(glide_from_string("1.5"))
+    assert hash(glide_from_string("-0.0")) == hash(ZERO)
+    assert len({glide_from_int(10), glide_from_string("10.000"), TEN}) == 1
+
+
+def test_comparison_with_other_types():
+    g = Glide(1.0)
+    assert g != None and g not in [1, "x"] and {g: 1, None: 2}[g] == 1  # noqa: E711
+    with pytest.raises(TypeError):
+        g < 1
+
+
+def test_views_follow_changes(r):
+    for _ in range(100):
+        text = random_glide_text(r).lstrip("-")
+        g = glide_from_string(text)
+        digits = (g.get_units(), g.get_decs(), g.get_mantissa(), g.get_pow(), str(g))
+
+        # the views come back the same, and nothing outside can change the cached ones
+        g.get_units().append(7)
+        assert (g.get_units(), g.get_decs(), g.get_mantissa(), g.get_pow(), str(g)) == digits
+
+        shift = r.randrange(-12, 12)
+        g.set_pow(g.get_pow() + shift)
+        h = glide_from_string(text)
+        expected = h.left_shift(shift) if shift >= 0 else h.right_shift(-shift)
+        assert (g.get_units(), g.get_decs(), g.get_mantissa(), str(g)) == \
+            (expected.get_units(), expected.get_decs(), expected.get_mantissa(), str(expected))
+
+    g = glide_from_string("12.5")
+    g.get_decs()
+    g.set_units([3])
+    assert str(g) == "3.5" and g.get_units() == [3]
+    g.set_mantissa([9, 1])
+    assert str(g) == "9.1" and g.get_pow() == 0
+    g = copy.copy(g)
+    g.get_units()
+    g.accumulate(glide_from_int(10))
+    assert g.get_units() == [1, 9] and str(g) == "19.1"
+
+
+@pytest.mark.parametrize("rounding", ROUNDING_MODES)
+def test_sqrt(r, rounding):
+    for _ in range(50):
+        prec = r.randrange(1, 40)
+        x = random_glide_text(r).lstrip("-")
+        with localcontext(prec=prec, rounding=rounding):
+            got = decimal.Decimal(str(glide_from_string(x).sqrt()))
+
+        # decimal's sqrt always rounds half even, so it's taken further and rounded after
+        root = decimal.Context(prec=prec + 30).sqrt(decimal.Decimal(x))
+        assert got == decimal.Context(prec=prec, rounding=rounding).plus(root)
+
+
+def test_nthroot(r):
+    for _ in range(100):
+        k, prec = r.randrange(3, 8), r.randrange(1, 30)
+        x = glide_from_string(random_glide_text(r))
+        if x.get_sign() == "-ve" and k % 2 == 0:
+            with pytest.raises(ValueError):
+                x.nthroot(k)
+            continue
+
+        with localcontext(prec=prec, rounding=ROUND_DOWN):
+            root = x.nthroot(k)
+
+        # cut off to prec significant digits, so one more in the last place is too big
+        y, unit = abs(fraction(root)), Fraction(10) ** (root.get_pow() - prec + 1)
+        assert y ** k <= abs(fraction(x)) < (y + unit) ** k
+        assert root.get_sign() == x.get_sign() or x == ZERO
+
+    assert str(glide_from_string("-3.375").nthroot(3)) == "-1.5"
+    assert glide_from_int(10 ** 40 + 7).isqrt() == glide_from_int(10 ** 20)
+    assert glide_from_string("99.99").isqrt() == glide_from_int(9)
+
+
+def test_own_precision_cuts_like_division():
+    assert str(glide_from_string("15241383936").set_precision(5).sqrt()) == "123456.0"
+    assert str(glide_from_int(123456).set_precision(5) / glide_from_int(7)) == "17636.0"
+    assert str(glide_from_int(2).set_precision(8).sqrt()) == "1.4142135"
+
+
+def test_binary_format(r):
+    values = [glide_from_string(random_glide_text(r)) for _ in range(50)]
+    values += [glide_from_int(0), glide_from_string("-0.001").set_precision(7), ONE,
+               glide_from_int(3).left_shift(40)]
+
+    f = io.BytesIO()
+    for g in values:
+        dump_glide(g, f)
+    f.seek(0)
+
+    for g in values:
+        copies = glide_from_bytes(glide_to_bytes(g)), load_glide(f), pickle.loads(pickle.dumps(g))
+        for c in copies:
+            assert c == g and c.get_sign() == g.get_sign()
+            assert c.get_precision() == g.get_precision()
+
+    with pytest.raises(ValueError):
+        glide_from_bytes(glide_to_bytes(values[0])[:-1])
+    with pytest.raises(ValueError):
+        glide_from_bytes(b"NOTAGLIDE" + glide_to_bytes(values[0])[9:])
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Checks of GlideArray against Fractions truncated to the same number of decimal places.
+
+    python -m pytest -q test_glidearray.py
+"""
+from fractions import Fraction
+
+import pytest
+
+import limbs
+from conftest import fraction, random_glide_text
+from Main import glide_from_int, glide_from_string
+
+if limbs._numpy() is None:
+    pytest.skip("GlideArray needs NumPy", allow_module_level=True)
+
+from glidearray import GlideArray  # noqa: E402
+
+
+def _truncate(f: Fraction, places: int) -> Fraction:
+    """
+    f cut off towards zero after `places` decimal places, as a GlideArray keeps it.
+    """
+    cut = Fraction(abs(f.numerator) * 10 ** places // f.denominator, 10 ** places)
+
+    return -cut if f < 0 else cut
+
+
+@pytest.mark.parametrize("places", [9, 18, 30])
+def test_arithmetic(r, places):
+    a = [glide_from_string(random_glide_text(r)) for _ in range(40)] + [glide_from_int(0)]
+    b = [glide_from_string(random_glide_text(r)) for _ in range(40)] + [glide_from_int(-3)]
+    b[5] = glide_from_string("-" + str(a[5]).lstrip("-"))  # a sum that cancels out
+
+    ga, gb = GlideArray(a, places), GlideArray(b, places)
+    p = ga.get_places()
+    assert p % 9 == 0 and p >= places
+    fa = [_truncate(fraction(x), p) for x in a]
+    fb = [_truncate(fraction(x), p) for x in b]
+
+    assert [fraction(x) for x in ga.to_glides()] == fa
+    assert [fraction(x) for x in (ga + gb).to_glides()] == [x + y for x, y in zip(fa, fb)]
+    assert [fraction(x) for x in (ga - gb).to_glides()] == [x - y for x, y in zip(fa, fb)]
+    assert [fraction(x) for x in (ga * gb).to_glides()] == \
+        [_truncate(x * y, p) for x, y in zip(fa, fb)]
+    assert [fraction(x) for x in (-ga).to_glides()] == [-x for x in fa]
+    assert [fraction(x) for x in abs(ga).to_glides()] == [abs(x) for x in fa]
+
+    nonzero = [y or Fraction(1) for y in fb]
+    gn = GlideArray([glide_from_int(1) if not y else x for x, y in zip(b, fb)], places)
+    assert [fraction(x) for x in (ga / gn).to_glides()] == \
+        [_truncate(x / y, p) for x, y in zip(fa, nonzero)]
+
+    for op in ("__lt__", "__le__", "__eq__", "__ne__", "__ge__", "__gt__"):
+        assert list(getattr(ga, op)(gb)) == [getattr(x, op)(y) for x, y in zip(fa, fb)], op
+
+    assert fraction(ga.sum()) == sum(fa)
+    assert fraction(ga.dot(gb)) == _truncate(sum(x * y for x, y in zip(fa, fb)), p)
+    assert (ga - ga.to_glides()[5]).to_glides()[5].get_sign() == "+ve"
+
+
+def test_one_glide_broadcasts(r):
+    values = [glide_from_string(random_glide_text(r)) for _ in range(30)]
+    g = glide_from_string("-2.5")
+    ga = GlideArray(values)
+    fa = [_truncate(fraction(x), ga.get_places()) for x in values]
+
+    assert [fraction(x) for x in (ga + g).to_glides()] == [x - Fraction(5, 2) for x in fa]
+    assert [fraction(x) for x in (ga * g).to_glides()] == \
+        [_truncate(x * Fraction(-5, 2), ga.get_places()) for x in fa]
+    assert list(ga > g) == [x > Fraction(-5, 2) for x in fa]
+
+
+def test_divide_fix_up(r):
+    # quotients that land right on (or one unit either side of) whole numbers, where the
+    # reciprocal's estimate has to be stepped back into place
+    values, divisors = [], []
+    for _ in range(50):
+        d = r.randrange(1, 10 ** r.randrange(1, 40))
+        q = r.randrange(10 ** r.randrange(1, 40))
+        values.append(glide_from_int(q * d + r.choice([-1, 0, 1]) * (q > 0)))
+        divisors.append(glide_from_int(d))
+
+    quot = GlideArray(values, 9) / GlideArray(divisors, 9)
+    for g, x, d in zip(quot.to_glides(), values, divisors):
+        assert fraction(g) == _truncate(fraction(x) / fraction(d), 9)
+
+    with pytest.raises(ZeroDivisionError):
+        GlideArray(values[:3]) / GlideArray([glide_from_int(n) for n in (1, 0, 2)])
+
+
+def test_lengths():
+    with pytest.raises(ValueError):
+        GlideArray([glide_from_int(1)] * 3) + GlideArray([glide_from_int(1)] * 2)
+
+    assert GlideArray([]).sum() == glide_from_int(0)
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Checks that instrumentation counts calls without changing what they do.
+
+    python -m pytest -q test_instrument.py
+"""
+import copy
+
+import instrument
+import Main
+from conftest import fraction
+from Main import Glide, glide_from_int
+
+
+def test_tracing_leaves_behaviour_alone(r):
+    originals = Glide.accumulate, Glide.__iadd__, Main.glide_from_int
+    events = []
+    instrument.reset()
+    instrument.add_callback(events.append)
+
+    try:
+        with instrument.instrumented():
+            assert instrument.enabled() and Glide.accumulate is not originals[0]
+
+            # a running total is still worked on in its own buffer
+            total = copy.copy(Main.glide_from_int(r.getrandbits(30000)))
+            buffer, expected = total._limbs, fraction(total)
+            for _ in range(100):
+                term = Main.glide_from_int(r.getrandbits(60))
+                total.accumulate(term)
+                expected += fraction(term)
+            assert total._limbs is buffer and fraction(total) == expected
+
+            # and += still leaves the old value alone
+            alias = total
+            total += glide_from_int(1)
+            assert fraction(alias) == expected and fraction(total) == expected + 1
+    finally:
+        instrument.remove_callback(events.append)
+
+    assert not instrument.enabled()
+    assert (Glide.accumulate, Glide.__iadd__, Main.glide_from_int) == originals
+
+    stats = instrument.snapshot()
+    assert stats["operators"]["accumulate"]["calls"] == 100
+    assert stats["operators"]["__iadd__"]["calls"] == 1
+    assert stats["kernels"]["iadd"]["calls"] >= 100
+    assert stats["conversions"]["glide_from_int"]["calls"] == 102
+    assert sum(e["name"] == "accumulate" for e in events) == 100
+    instrument.reset()
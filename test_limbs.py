@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Checks of the limb kernels against Python's ints. The kernels are run directly as well as
+through their dispatchers, and with their thresholds moved, so retuning KARATSUBA_THRESHOLD,
+NTT_THRESHOLD and the rest can't quietly break them.
+
+    python -m pytest -q test_limbs.py
+"""
+import pytest
+
+import limbs
+from conftest import random_limbs
+
+
+def _int(a) -> int:
+    return limbs.to_int(a)
+
+
+@pytest.mark.parametrize("kernel", [limbs.mul_schoolbook, limbs.mul_karatsuba, limbs.mul_toom3,
+                                    limbs.mul_ntt, limbs.mul])
+def test_mul_kernels(r, kernel):
+    for n, m in ((0, 5), (1, 1), (3, 2), (57, 56), (151, 149), (300, 90), (520, 500), (700, 3)):
+        a, b = random_limbs(r, n), random_limbs(r, m)
+        assert _int(kernel(a, b)) == _int(a) * _int(b), (n, m)
+
+    # carries all the way up
+    nines = limbs.new([limbs.BASE - 1] * 200)
+    assert _int(kernel(nines, nines)) == _int(nines) ** 2
+
+
+def test_mul_ntt_without_numpy(r, monkeypatch):
+    monkeypatch.setattr(limbs, "_numpy", lambda: None)
+
+    for n, m in ((1, 1), (300, 200), (700, 3)):
+        a, b = random_limbs(r, n), random_limbs(r, m)
+        assert _int(limbs.mul_ntt(a, b)) == _int(a) * _int(b), (n, m)
+
+
+@pytest.mark.parametrize("karatsuba, toom3, ntt", [(2, 4, 8), (8, 8, 10 ** 9), (10 ** 9,) * 3])
+def test_mul_thresholds(r, monkeypatch, karatsuba, toom3, ntt):
+    monkeypatch.setattr(limbs, "KARATSUBA_THRESHOLD", karatsuba)
+    monkeypatch.setattr(limbs, "TOOM3_THRESHOLD", toom3)
+    monkeypatch.setattr(limbs, "NTT_THRESHOLD", ntt)
+
+    for n, m in ((5, 5), (40, 17), (64, 64), (200, 150)):
+        a, b = random_limbs(r, n), random_limbs(r, m)
+        assert _int(limbs.mul(a, b)) == _int(a) * _int(b), (n, m)
+
+
+@pytest.mark.parametrize("divide", [limbs.long_divmod, limbs.newton_divmod, limbs.divide])
+def test_divide(r, divide):
+    for n, m in ((1, 1), (2, 1), (10, 3), (60, 59), (120, 40), (900, 450), (3, 7)):
+        a, b = random_limbs(r, n), random_limbs(r, m) or limbs.new([1])
+        q, rem = divide(a, b)
+        assert (_int(q), _int(rem)) == divmod(_int(a), _int(b)), (n, m)
+
+    # a divisor whose top limb is 1, the worst case for the quotient estimates
+    b = limbs.new([0] * 30 + [1])
+    a = random_limbs(r, 70)
+    assert tuple(map(_int, divide(a, b))) == divmod(_int(a), _int(b))
+
+
+def test_divide_newton_threshold(r, monkeypatch):
+    monkeypatch.setattr(limbs, "NEWTON_THRESHOLD", 4)
+    monkeypatch.setattr(limbs, "RECIPROCAL_BASE_DIGITS", 20)
+
+    for n, m in ((10, 5), (50, 20), (80, 40)):
+        a, b = random_limbs(r, n), random_limbs(r, m)
+        assert tuple(map(_int, limbs.divide(a, b))) == divmod(_int(a), _int(b))
+
+
+def test_reciprocal(r):
+    for n, p in ((1, 5), (12, 100), (40, 400)):
+        b = random_limbs(r, n)
+        digits = limbs.num_digits(b)
+        exact = 10 ** (digits + p) // _int(b)
+        assert abs(_int(limbs.reciprocal(b, p)) - exact) <= 4
+
+
+def test_int_conversion(r, monkeypatch):
+    # the bit splitting used for very long ints, at a size that's quick to check
+    monkeypatch.setattr(limbs, "INT_SPLIT_LIMBS", 4)
+    monkeypatch.setattr(limbs, "INT_MUL_SPLIT_LIMBS", 300)
+
+    for bits in (0, 1, 29, 30, 8000, 9000, 30000, 70000):
+        for x in (r.getrandbits(bits), (1 << bits) - 1, 10 ** (bits // 4)):
+            a = limbs.from_int(x)
+            assert limbs.to_int(a) == x
+            assert all(limb < limbs.BASE for limb in a) and (not a or a[-1])
+
+
+def test_str_conversion(r):
+    for n in (0, 1, 5, 300):
+        a = random_limbs(r, n)
+        text = limbs.to_str(a)
+        assert limbs.from_str(text) == a and text == str(_int(a))
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_add_sub(r, backend):
+    if backend == "numpy" and limbs._numpy() is None:
+        pytest.skip("NumPy isn't installed")
+
+    for n, m in ((0, 0), (1, 0), (5, 3), (300, 300), (300, 1)):
+        a, b = random_limbs(r, n), random_limbs(r, m)
+        if limbs.cmp(a, b) < 0:
+            a, b = b, a
+        assert _int(limbs.add(a, b, backend=backend)) == _int(a) + _int(b)
+        assert _int(limbs.sub(a, b, backend=backend)) == _int(a) - _int(b)
+
+    nines, one = limbs.new([limbs.BASE - 1] * 300), limbs.new([1])
+    assert _int(limbs.add(nines, one, backend=backend)) == _int(nines) + 1
+    assert _int(limbs.sub(limbs.add(nines, one), one, backend=backend)) == _int(nines)
+
+
+def test_roots(r):
+    for k in (1, 2, 3, 5):
+        for n in (1, 3, 20, 70):
+            x = _int(random_limbs(r, n))
+            root, exact = limbs.root(limbs.from_int(x), k)
+            y = _int(root)
+            assert y ** k <= x < (y + 1) ** k and exact == (y ** k == x)
+
+
+def test_mul_parallel(r):
+    workers, threshold = limbs.PARALLEL_WORKERS, limbs.PARALLEL_THRESHOLD
+    limbs.set_parallel(2, 40)
+    try:
+        for n, m in ((40, 40), (120, 90), (300, 300)):
+            a, b = random_limbs(r, n), random_limbs(r, m)
+            assert _int(limbs.mul(a, b)) == _int(a) * _int(b), (n, m)
+            assert _int(limbs.mul_parallel(a, b)) == _int(a) * _int(b), (n, m)
+
+        # the signed sub-products, some of them empty, come back in order
+        pairs = [((False, random_limbs(r, 50)), (True, random_limbs(r, 30))),
+                 ((True, random_limbs(r, 7)), (True, limbs.new())),
+                 ((False, limbs.new([1])), (False, random_limbs(r, 60)))]
+        for ((x_neg, x), (y_neg, y)), (neg, product) in zip(pairs,
+                                                             limbs._pool_products(pairs, 2)):
+            assert neg == (x_neg != y_neg) and _int(product) == _int(x) * _int(y)
+    finally:
+        limbs.set_parallel(workers, threshold)
+
+    assert (limbs.PARALLEL_WORKERS, limbs.PARALLEL_THRESHOLD) == (workers, threshold)
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Round trips through PackedGlides.
+
+    python -m pytest -q test_packed.py
+"""
+import pytest
+
+import limbs
+from conftest import random_glide_text
+from Main import ONE, glide_from_int, glide_from_string
+from packed import PackedGlides
+
+
+def test_round_trip(r):
+    values = [glide_from_string(random_glide_text(r)) for _ in range(100)]
+    values += [glide_from_int(0), glide_from_string("-0.0"), ONE, glide_from_int(-5).left_shift(30),
+               glide_from_string("-2.5").set_precision(12), glide_from_int(10 ** 60)]
+
+    packed = PackedGlides(values[:50])
+    packed.extend(values[50:-1])
+    packed.append(values[-1])
+    assert len(packed) == len(values)
+
+    for i, g in enumerate(values):
+        for got in (packed[i], packed[i - len(values)], packed.to_glides()[i]):
+            assert got == g and got.get_precision() == g.get_precision()
+            assert got.get_sign() == ("-ve" if g.get_sign() == "-ve" and g._limbs else "+ve")
+
+        buffer, exp, negative = packed.get_limbs(i)
+        assert (limbs.to_int(buffer), exp) == (limbs.to_int(g._limbs), g._exp)
+        assert negative == (g.get_sign() == "-ve" and bool(g._limbs))
+
+    # a value taken out is a copy, and changing it leaves the store alone
+    packed[0].set_sign("-ve" if values[0].get_sign() == "+ve" else "+ve")
+    assert packed[0] == values[0] and str(packed[-1]) == str(values[-1])
+
+    for i in (len(values), -len(values) - 1):
+        with pytest.raises(IndexError):
+            packed[i]
+
+
+def test_nbytes():
+    packed = PackedGlides()
+    empty = packed.nbytes()
+    packed.extend([glide_from_int(10 ** 30), glide_from_string("1.5")])
+
+    # 4 bytes per limb, and 17 bytes of bookkeeping a value
+    assert packed.nbytes() - empty == 4 * (4 + 1) + 2 * 17
+    assert list(PackedGlides([1.5, 2])) == [glide_from_string("1.5"), glide_from_int(2)]
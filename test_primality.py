@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+Checks of isprime against a sieve and against known pseudoprimes and primes.
+
+    python -m pytest -q test_primality.py
+"""
+import pytest
+
+from primality import isprime
+
+
+def test_isprime_small():
+    sieve = bytearray([1]) * 20000
+    sieve[:2] = b"\0\0"
+    for i in range(2, 142):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(sieve[i * i::i]))
+
+    assert [n for n in range(20000) if isprime(n)] == [n for n in range(20000) if sieve[n]]
+
+
+@pytest.mark.parametrize("n, prime", [
+    (561, False),  # Carmichael
+    (3215031751, False),  # strong pseudoprime to bases 2, 3, 5 and 7
+    (3825123056546413051, False),  # strong pseudoprime to the first nine prime bases
+    (318665857834031151167461, False),  # strong pseudoprime to the first twelve prime bases
+    (2 ** 61 - 1, True),
+    (2 ** 89 - 1, True),
+    (2 ** 127 - 1, True),
+    ((2 ** 127 - 1) * (2 ** 61 - 1), False),
+    (10 ** 100 + 267, True),
+])
+def test_isprime_hard(n, prime):
+    assert isprime(n) == prime
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Checks of the rolling-window prime scanner against slicing out every window and testing it.
+
+    python -m pytest -q test_scanner.py
+"""
+import pytest
+
+from primality import isprime
+from scanner import scan_primes
+
+
+def _naive(text: str, width: int, limit: int = None) -> list[tuple[int, int]]:
+    stop = len(text) - width + 1 if limit is None else min(limit, len(text) - width + 1)
+
+    return [(i, int(text[i:i + width])) for i in range(stop) if isprime(int(text[i:i + width]))]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_scan_primes(r, workers):
+    text = "".join(r.choice("0123456789") for _ in range(3000))
+
+    for width in (1, 4, 10):
+        expected = _naive(text, width)
+        assert scan_primes(text, width, first=False, workers=workers, batch_size=16) == expected
+        assert scan_primes(text, width, workers=workers, batch_size=16) == expected[:1]
+
+    chunks = [text[i:i + 7].encode() for i in range(0, len(text), 7)]
+    assert scan_primes(iter(chunks), 6, first=False, workers=workers, limit=1234) == \
+        _naive(text, 6, 1234)
+    assert scan_primes("2" * 20, 3, first=False, workers=workers) == []
+    assert scan_primes("4" * 20, 3, workers=workers) == []
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Checks of the series engine against exact Fraction sums and the digits in accurate_e.txt, and
+of summing through checkpoints.
+
+    python -m pytest -q test_series.py
+"""
+import os
+from fractions import Fraction
+from math import prod
+
+import pytest
+
+from Main import glide_to_int
+from series import LEAF_TERMS, FileCheckpoint, binary_split, compute_e, e_terms, sum_series
+
+
+def test_binary_split():
+    a, p, q = (lambda n: 2 * n + 1), (lambda n: n + 3), (lambda n: 5 * n + 2)
+
+    for n1, n2 in ((0, 1), (0, LEAF_TERMS), (3, 3 + LEAF_TERMS + 1), (0, 100), (17, 90)):
+        big_p, big_q, big_t = map(glide_to_int, binary_split(a, p, q, n1, n2))
+
+        total, ratio = Fraction(0), Fraction(1)
+        for n in range(n1, n2):
+            ratio *= Fraction(p(n), q(n))
+            total += a(n) * ratio
+
+        assert Fraction(big_t, big_q) == total, (n1, n2)
+        assert big_p == prod(map(p, range(n1, n2))) and big_q == prod(map(q, range(n1, n2)))
+
+
+def test_e():
+    with open(os.path.join(os.path.dirname(__file__), "accurate_e.txt")) as f:
+        digits = f.read(1001).replace(".", "")
+
+    assert str(compute_e(1000)).replace(".", "")[:990] == digits[:990]
+
+
+def test_checkpoint_resume(tmp_path):
+    class Crash(Exception):
+        pass
+
+    class Flaky(FileCheckpoint):
+        saves = 3
+
+        def save(self, state):
+            if self.saves == 0:
+                raise Crash
+            self.saves -= 1
+            super().save(state)
+
+    path = tmp_path / "e.ckpt"
+    terms = e_terms(2000)
+    e = (lambda n: 1, lambda n: 1, lambda n: n or 1)
+
+    with pytest.raises(Crash):
+        sum_series(*e, terms, 2000, Flaky(path), checkpoint_terms=100)
+    assert FileCheckpoint(path).load().index == 300
+
+    resumed = sum_series(*e, terms, 2000, FileCheckpoint(path), checkpoint_terms=100)
+    assert resumed == compute_e(2000)
+    assert not path.exists()
+
+
+def test_checkpoint_of_another_sum_is_ignored(tmp_path):
+    path = tmp_path / "series.ckpt"
+    e = (lambda n: 1, lambda n: 1, lambda n: n or 1)
+    other = (lambda n: 1, lambda n: 1, lambda n: 2 * n or 1)
+
+    class Stop(FileCheckpoint):
+        def save(self, state):
+            super().save(state)
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        sum_series(*e, 200, 100, Stop(path), checkpoint_terms=50)
+
+    # a different series, or the same one to a different number of terms, starts over
+    expected = sum_series(*other, 200, 100)
+    assert sum_series(*other, 200, 100, FileCheckpoint(path), checkpoint_terms=50) == expected
+    with pytest.raises(KeyboardInterrupt):
+        sum_series(*e, 200, 100, Stop(path), checkpoint_terms=50)
+    assert sum_series(*e, 150, 100, FileCheckpoint(path), checkpoint_terms=50) == \
+        sum_series(*e, 150, 100)
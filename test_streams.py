@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Checks that streamed digits are the constants' own, and of the chunking around them.
+
+    python -m pytest -q test_streams.py
+"""
+import pytest
+
+import elementary
+from Main import glide_to_string
+from series import compute_e
+from streams import _known, digits, e_chunks, pi_chunks, rechunk, stream
+
+
+def _exactly(compute, count: int) -> str:
+    return glide_to_string(compute(count + 30))[:count]
+
+
+@pytest.mark.parametrize("text, known", [
+    ("31415926", 6),
+    ("31415999", 4),  # out by a unit and a half, ...5999 could be ...6000
+    ("31416001", 4),
+    ("27180000", 3),  # and ...8000 could be ...7999
+    ("27180002", 6),
+    ("99999999", 0),
+    ("10000000", 0),
+    ("5", 0),
+])
+def test_known(text, known):
+    assert _known(text) == known
+
+
+def test_known_digits_are_certain(r):
+    for _ in range(2000):
+        text = "".join(r.choice("09" if r.random() < 0.5 else "0123456789")
+                       for _ in range(r.randrange(2, 12)))
+        k = _known(text)
+        if not k:
+            continue
+        scale = 2 * 10 ** (len(text) - k)
+
+        # anything within a unit and a half of the last place starts with the same k digits
+        for off in range(-3, 4):
+            assert (2 * int(text) + off) // scale == int(text[:k]), (text, off)
+
+
+def test_streams_match_the_constants():
+    assert "".join(e_chunks(limit=1500)) == _exactly(compute_e, 1500)
+    assert "".join(pi_chunks(limit=1200)) == _exactly(elementary._compute_pi, 1200)
+
+    # starting low, so the precision doubles a few times on the way
+    chunks = list(stream(elementary.pi, limit=900, chunk_size=64, precision=40))
+    assert "".join(chunks) == _exactly(elementary._compute_pi, 900)
+    assert all(len(chunk) == 64 for chunk in chunks[:-1])
+    assert list(digits(stream(elementary.e, limit=10, precision=20))) == \
+        [2, 7, 1, 8, 2, 8, 1, 8, 2, 8]
+
+
+def test_rechunk(r):
+    for _ in range(500):
+        chunks = ["7" * r.randrange(0, 30) for _ in range(r.randrange(0, 8))]
+        size = r.randrange(1, 12)
+        text = "".join(chunks)
+        assert list(rechunk(chunks, size)) == [text[i:i + size] for i in range(0, len(text), size)]